@@ -0,0 +1,45 @@
+"""Synthetic projects shared by the benchmarks.
+
+Benchmarks run as scripts from this directory, so they import it as _common.
+"""
+
+import yaml
+
+TOPICS = ["data_exploration", "modeling", "results"]
+
+
+def topic_ids(count: int) -> list[str]:
+    """IDs of count numbered topics: topic_0, topic_1, ..."""
+    return ["topic_" + str(t) for t in range(count)]
+
+
+def make_registry(slide_count: int, topics: list[str] = TOPICS, caption_repeat: int = 1) -> dict:
+    """Build a synthetic registry with slide_count slides spread over topics in turn.
+
+    Captions are repeated caption_repeat times, to make rendering rather than
+    loading dominate.
+    """
+    slides = []
+    for i in range(slide_count):
+        topic_id = topics[i % len(topics)]
+        slides.append({
+            "id": "2026-01-01_figure_" + str(i),
+            "topic": topic_id,
+            "title": "Figure " + str(i),
+            "caption": ("Synthetic caption for figure " + str(i) + ". ") * caption_repeat,
+            "notes": "Speaker notes " + str(i),
+            "figure": "figures/" + topic_id + "/figure_" + str(i) + ".png",
+            "created": "2026-01-" + str(1 + i % 28).zfill(2),
+            "tags": ["synthetic", topic_id],
+        })
+    return {
+        "title": "Benchmark",
+        "topics": [{"id": t, "name": t.replace("_", " ").title(), "order": n} for n, t in enumerate(topics, 1)],
+        "slides": slides,
+    }
+
+
+def write_registry(registry: dict) -> None:
+    """Write registry as slides.yaml in the current directory, as yaml.dump lays it out."""
+    with open("slides.yaml", "w") as f:
+        yaml.dump(registry, f, sort_keys=False)
@@ -0,0 +1,65 @@
+"""Benchmark extracting figure versions with one git process per version vs git cat-file --batch.
+
+Usage: python benchmarks/bench_blob_extract.py [REVISION_COUNT]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from slidedeck.history import GitBlobReader, extract_figure_version
+
+FIGURE = "figures/results/plot.png"
+
+
+def git(*args: str) -> str:
+    """Run a git command in the current directory and return its output."""
+    env = dict(os.environ, GIT_AUTHOR_NAME="bench", GIT_AUTHOR_EMAIL="bench@example.com")
+    env.update(GIT_COMMITTER_NAME="bench", GIT_COMMITTER_EMAIL="bench@example.com")
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True, env=env).stdout
+
+
+def make_repository(revisions: int) -> list[str]:
+    """Commit the given number of revisions of one figure. Returns commits, newest first."""
+    git("init", "-q")
+    Path(FIGURE).parent.mkdir(parents=True)
+    for i in range(revisions):
+        Path(FIGURE).write_bytes(os.urandom(32 * 1024))
+        git("add", FIGURE)
+        git("commit", "-q", "-m", "revision " + str(i))
+    return git("log", "--format=%H").split()
+
+
+def main() -> None:
+    revisions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    try:
+        commits = make_repository(revisions)
+        out = Path("version.png")
+        print("Repository: " + str(revisions) + " revisions of " + FIGURE)
+
+        start = time.perf_counter()
+        for commit in commits:
+            extract_figure_version(FIGURE, commit, out)
+        per_process = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with GitBlobReader() as reader:
+            for commit in commits:
+                extract_figure_version(FIGURE, commit, out, reader)
+        batched = time.perf_counter() - start
+
+        print("git show per version".ljust(28) + str(round(per_process * 1000)).rjust(8) + " ms")
+        print("git cat-file --batch".ljust(28) + str(round(batched * 1000)).rjust(8) + " ms")
+        print("Speedup: " + str(round(per_process / batched, 1)) + "x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark peak memory of building slides.qmd as one string vs streaming it to disk.
+
+Usage: python benchmarks/bench_build_memory.py [SLIDE_COUNT]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from _common import make_registry
+
+from slidedeck.build import build_slides_qmd, group_slides_by_topic, iter_slides_qmd, write_if_changed
+
+
+def measure(label: str, fn) -> None:
+    """Run fn under tracemalloc and print its peak allocation and wall time."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_mib = str(round(peak / 1024 / 1024, 1))
+    print(label.ljust(32) + peak_mib.rjust(8) + " MiB peak" + str(round(elapsed, 2)).rjust(8) + " s")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Long captions make the document size, not the registry, dominate
+    registry = make_registry(count, caption_repeat=20)
+
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    try:
+        print("Registry: " + str(count) + " slides")
+
+        def in_memory():
+            Path("slides.qmd").write_text(build_slides_qmd(registry))
+
+        def streaming():
+            chunks = iter_slides_qmd(registry["title"], registry["topics"], group_slides_by_topic(registry))
+            write_if_changed(Path("slides.qmd"), chunks, {})
+
+        measure("join + write_text", in_memory)
+        Path("slides.qmd").unlink()
+        measure("streaming writer", streaming)
+        print("Output size: " + str(Path("slides.qmd").stat().st_size // 1024 // 1024) + " MiB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
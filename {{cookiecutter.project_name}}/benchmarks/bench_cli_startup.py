@@ -0,0 +1,59 @@
+"""Benchmark CLI startup time, e.g. for pre-commit hooks that call slidedeck several times.
+
+Compares 'slidedeck --help' with an interpreter that only starts, and with
+one that imports every command module up front (what the CLI did before
+commands imported their modules lazily). Also lists the slowest imports
+reported by python -X importtime.
+
+Usage: python benchmarks/bench_cli_startup.py [RUNS]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+EAGER_IMPORTS = "import slidedeck.cli, slidedeck.add, slidedeck.build, slidedeck.history"
+
+
+def wall_time_ms(args: list[str], runs: int) -> float:
+    """Median wall time of running the Python interpreter with args."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def slowest_imports(args: list[str], count: int) -> list[tuple[int, str]]:
+    """(cumulative microseconds, module) of the top-level imports that took longest."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # Nested imports are indented further; keep the top level only
+        if not fields[2].startswith("  "):
+            imports.append((int(fields[1]), fields[2].strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rows = [
+        ("interpreter only", ["-c", "pass"]),
+        ("slidedeck --help", ["-m", "slidedeck.cli", "--help"]),
+        ("all command modules imported", ["-c", EAGER_IMPORTS]),
+    ]
+    for label, args in rows:
+        print(label.ljust(32) + str(round(wall_time_ms(args, runs), 1)).rjust(8) + " ms")
+
+    print("\nSlowest imports for slidedeck --help:")
+    for micros, module in slowest_imports(["-m", "slidedeck.cli", "--help"], 5):
+        print("  " + module.ljust(30) + str(round(micros / 1000, 1)).rjust(8) + " ms")
+
+
+if __name__ == "__main__":
+    main()
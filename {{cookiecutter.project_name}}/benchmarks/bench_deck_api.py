@@ -0,0 +1,84 @@
+"""Benchmark registering figures from a script: 'slidedeck add' subprocesses vs the Deck API.
+
+Simulates a training loop that registers one figure per step, on a registry
+that already holds many slides.
+
+Usage: python benchmarks/bench_deck_api.py [FIGURE_COUNT] [SLIDE_COUNT]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import make_registry, write_registry
+
+from slidedeck import Deck
+
+
+def make_project(slide_count: int, figure_count: int) -> list[str]:
+    """Write slides.yaml with the given number of slides. Returns paths of figures to add."""
+    write_registry(make_registry(slide_count, ["results"]))
+    Path("figures/results").mkdir(parents=True)
+    figures = []
+    for i in range(figure_count):
+        figure = Path("figures/results/step_" + str(i) + ".png")
+        figure.write_bytes(b"")
+        figures.append(str(figure))
+    return figures
+
+
+def reset(snapshot: bytes) -> None:
+    Path("slides.yaml").write_bytes(snapshot)
+
+
+def main() -> None:
+    figure_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    slide_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    try:
+        figures = make_project(slide_count, figure_count)
+        snapshot = Path("slides.yaml").read_bytes()
+        print("Registry: " + str(slide_count) + " slides, adding " + str(figure_count) + " figures")
+
+        timings = []
+        start = time.perf_counter()
+        for figure in figures:
+            subprocess.run([sys.executable, "-m", "slidedeck.cli", "add", figure], capture_output=True, check=True)
+        timings.append(("slidedeck add per figure", time.perf_counter() - start))
+
+        reset(snapshot)
+        deck = Deck()
+        start = time.perf_counter()
+        for figure in figures:
+            deck.add(figure)
+        timings.append(("Deck.add per figure", time.perf_counter() - start))
+
+        reset(snapshot)
+        journaled = Deck(journal=True)
+        start = time.perf_counter()
+        for figure in figures:
+            journaled.add(figure)
+        timings.append(("Deck(journal=True).add", time.perf_counter() - start))
+        Path("slides.journal").unlink()
+
+        reset(snapshot)
+        start = time.perf_counter()
+        with deck.batch():
+            for figure in figures:
+                deck.add(figure)
+        timings.append(("Deck.add in batch()", time.perf_counter() - start))
+
+        for label, elapsed in timings:
+            per_figure = str(round(elapsed * 1000 / figure_count, 2)) + " ms/figure"
+            print(label.ljust(28) + str(round(elapsed * 1000)).rjust(8) + " ms" + per_figure.rjust(20))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark the in-process git object reader against git subprocesses on a synthetic repository.
+
+The repository holds thousands of revisions of a few figures, packed with
+git gc so most versions are stored as deltas.
+
+Usage: python benchmarks/bench_object_reader.py [REVISION_COUNT]
+"""
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from slidedeck.gitobjects import ObjectStore
+from slidedeck.history import IN_PROCESS_OBJECTS, GitBlobReader, _git_head, _walk_history
+
+FIGURES = ["figures/results/plot.png", "figures/modeling/fit.png", "figures/data_exploration/hist.png"]
+
+
+def make_repository(revisions: int) -> None:
+    """Commit revisions of the figures with git fast-import, then pack them."""
+    subprocess.run(["git", "init", "-q"], check=True)
+    rng = random.Random(0)
+    images = {path: bytearray(rng.randbytes(48 * 1024)) for path in FIGURES}
+    stream = []
+    for i in range(revisions):
+        path = FIGURES[i % len(FIGURES)]
+        image = images[path]
+        # Small edits, like re-rendering a plot with slightly different data
+        start = rng.randrange(len(image) - 512)
+        image[start:start + 512] = rng.randbytes(512)
+        message = ("revision " + str(i)).encode()
+        stream.append(b"commit refs/heads/main\n")
+        stream.append(b"committer bench <bench@example.com> " + str(1700000000 + i).encode() + b" +0000\n")
+        stream.append(b"data " + str(len(message)).encode() + b"\n" + message + b"\n")
+        stream.append(b"M 100644 inline " + path.encode() + b"\ndata " + str(len(image)).encode() + b"\n")
+        stream.append(bytes(image) + b"\n")
+    subprocess.run(["git", "fast-import", "--quiet"], input=b"".join(stream), check=True)
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+    subprocess.run(["git", "gc", "-q"], check=True)
+
+
+def timed(fn, repeat: int) -> tuple[object, float]:
+    """Run fn repeat times. Returns its result and the mean wall time in ms."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def resolve_in_process(history: list[dict]) -> list[str]:
+    with ObjectStore.open() as objects:
+        return [objects.blob_id(e["commit"], e["path"]) for e in history]
+
+
+def resolve_subprocess(history: list[dict]) -> list[str]:
+    specs = "".join(e["commit"] + ":./" + e["path"] + "\n" for e in history)
+    command = ["git", "cat-file", "--batch-check"]
+    result = subprocess.run(command, input=specs, capture_output=True, text=True, check=True)
+    return [line.split()[0] for line in result.stdout.splitlines()]
+
+
+def read_all(history: list[dict], in_process_reads: int) -> list[bytes]:
+    with GitBlobReader(in_process_reads=in_process_reads) as reader:
+        return [reader.read(entry["commit"], entry["path"]) for entry in history]
+
+
+def report(label: str, in_process, subprocess_fn, repeat: int) -> None:
+    """Time both implementations, check they agree and print one result row."""
+    expected, subprocess_ms = timed(subprocess_fn, repeat)
+    result, in_process_ms = timed(in_process, repeat)
+    assert result == expected, label + ": in-process result differs from git"
+    speedup = str(round(subprocess_ms / in_process_ms, 2)) + "x"
+    columns = [(str(round(in_process_ms, 2)) + " ms").rjust(12), (str(round(subprocess_ms, 2)) + " ms").rjust(12)]
+    print(label.ljust(28) + "".join(columns) + speedup.rjust(10))
+
+
+def main() -> None:
+    revisions = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    try:
+        make_repository(revisions)
+        history = _walk_history([FIGURES[0]])[0][FIGURES[0]]
+        print("Repository: " + str(revisions) + " revisions, " + str(len(history)) + " of " + FIGURES[0])
+        print("".ljust(28) + "in-process".rjust(12) + "git".rjust(12) + "speedup".rjust(10))
+
+        report("resolve HEAD", _git_head, lambda: subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip(), 50)
+        for count in (5, IN_PROCESS_OBJECTS, len(history)):
+            versions = history[:count]
+            repeat = 20 if count <= IN_PROCESS_OBJECTS else 1
+            report("resolve " + str(count) + " blobs", lambda versions=versions: resolve_in_process(versions),
+                   lambda versions=versions: resolve_subprocess(versions), repeat)
+            report("read " + str(count) + " versions", lambda versions=versions: read_all(versions, len(versions)),
+                   lambda versions=versions: read_all(versions, 0), repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark rendering slides.qmd serially vs with a process pool on a many-topic registry.
+
+Decks smaller than slidedeck.build.PARALLEL_MIN_SLIDES render serially
+whatever jobs is, so keep TOPIC_COUNT x SLIDES_PER_TOPIC above it.
+
+Usage: python benchmarks/bench_parallel_build.py [TOPIC_COUNT] [SLIDES_PER_TOPIC]
+"""
+
+import os
+import sys
+import time
+
+from _common import make_registry, topic_ids
+
+from slidedeck.build import group_slides_by_topic, iter_slides_qmd
+
+
+def main() -> None:
+    topic_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    per_topic = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    # Long captions make rendering, not loading, dominate
+    registry = make_registry(topic_count * per_topic, topic_ids(topic_count), caption_repeat=10)
+    sections = group_slides_by_topic(registry)
+    print("Registry: " + str(topic_count) + " topics x " + str(per_topic) + " slides")
+
+    reference = None
+    baseline = None
+    jobs_options = sorted({1, 2, 4, os.cpu_count() or 1})
+    for jobs in jobs_options:
+        start = time.perf_counter()
+        content = "".join(iter_slides_qmd(registry["title"], registry["topics"], sections, jobs=jobs))
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, baseline = content, elapsed
+        assert content == reference, "parallel output differs from serial output"
+        speedup = str(round(baseline / elapsed, 2)) + "x"
+        print(("jobs=" + str(jobs)).ljust(10) + str(round(elapsed * 1000)).rjust(8) + " ms" + speedup.rjust(10))
+    print("CPUs available: " + str(os.cpu_count()))
+
+
+if __name__ == "__main__":
+    main()
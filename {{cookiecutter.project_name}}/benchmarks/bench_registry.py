@@ -0,0 +1,60 @@
+"""Benchmark cold, edited and warm registry loads on a synthetic slides.yaml.
+
+Usage: python benchmarks/bench_registry.py [SLIDE_COUNT]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _common import make_registry
+
+from slidedeck.registry import CACHE_DIR, REGISTRY_PATH, load_registry, save_registry
+
+
+def timed(label: str, fn, repeat: int = 5) -> float:
+    """Run fn repeat times and print the best wall time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(label.ljust(40) + str(round(best * 1000, 2)).rjust(10) + " ms")
+    return best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    try:
+        save_registry(make_registry(count))
+        print("Registry: " + str(count) + " slides, " + str(REGISTRY_PATH.stat().st_size // 1024) + " KiB")
+
+        def cold():
+            shutil.rmtree(CACHE_DIR, ignore_errors=True)
+            load_registry()
+
+        def touched():
+            os.utime(REGISTRY_PATH)
+            load_registry()
+
+        def edited():
+            text = REGISTRY_PATH.read_text()
+            REGISTRY_PATH.write_text(text.replace("for figure 7", "for figure 7!", 1))
+            load_registry()
+
+        cold_time = timed("cold (parse YAML, write cache)", cold, repeat=2)
+        load_registry()
+        timed("touched (hash check, no parse)", touched)
+        timed("one caption edited (re-parse 1 slide)", edited)
+        warm_time = timed("warm (stat + snapshot)", load_registry)
+        print("Speedup warm vs cold: " + str(round(cold_time / warm_time, 1)) + "x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark how long a training loop blocks per figure: synchronous save + add vs slidedeck.savefig.
+
+The synchronous baseline is fig.savefig() to a PNG followed by
+Deck(journal=True).add(), the same work the background writer does;
+slidedeck.savefig() only rasterizes on the caller and does the rest in the
+background. Needs matplotlib.
+
+Usage: python benchmarks/bench_savefig.py [FIGURE_COUNT] [SLIDE_COUNT]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from _common import make_registry, write_registry
+
+from slidedeck import Deck, savefig, writer
+from slidedeck.registry import load_slide_index
+
+
+def make_project(slide_count: int) -> None:
+    """Write slides.yaml with one topic and the given number of slides."""
+    write_registry(make_registry(slide_count, ["results"]))
+    Path("figures/results").mkdir(parents=True)
+
+
+def main() -> None:
+    figure_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    slide_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    try:
+        make_project(slide_count)
+        fig, ax = plt.subplots()
+        ax.plot(range(1000))
+        print("Registry: " + str(slide_count) + " slides, saving " + str(figure_count) + " figures")
+        # Parse slides.yaml once up front, as in a project that has been built before
+        load_slide_index()
+
+        deck = Deck(journal=True)
+        start = time.perf_counter()
+        for i in range(figure_count):
+            path = "figures/results/sync_" + str(i) + ".png"
+            fig.savefig(path, dpi=writer.DEFAULT_DPI)
+            deck.add(path)
+        synchronous = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(figure_count):
+            savefig(fig, "background_" + str(i), topic="results")
+        blocked = time.perf_counter() - start
+        writer.flush()
+        total = time.perf_counter() - start
+
+        for label, elapsed in [
+            ("fig.savefig + Deck.add", synchronous),
+            ("slidedeck.savefig (caller)", blocked),
+            ("slidedeck.savefig (total)", total),
+        ]:
+            per_figure = str(round(elapsed * 1000 / figure_count, 1)) + " ms/figure"
+            print(label.ljust(30) + str(round(elapsed * 1000)).rjust(8) + " ms" + per_figure.rjust(20))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark running slidedeck commands directly vs forwarded to 'slidedeck serve'.
+
+Creates a project with a large slides.yaml, then times 'add --journal' and
+'build' as separate processes, first without a server and then with one.
+
+Usage: python benchmarks/bench_serve.py [SLIDE_COUNT] [RUNS]
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import make_registry, topic_ids, write_registry
+
+from slidedeck.client import SOCKET_PATH
+
+
+def make_project(slide_count: int) -> None:
+    """Write slides.yaml with the given number of slides and one figure to add."""
+    write_registry(make_registry(slide_count, topic_ids(20)))
+    Path("figures/topic_0").mkdir(parents=True)
+    Path("figures/topic_0/new.png").write_bytes(b"")
+
+
+def wall_time_ms(args: list[str], runs: int) -> float:
+    """Median wall time of running the slidedeck entry point with args."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "slidedeck.client", *args], capture_output=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def time_commands(runs: int) -> list[float]:
+    add = wall_time_ms(["add", "figures/topic_0/new.png", "--journal"], runs)
+    build = wall_time_ms(["build"], runs)
+    return [add, build]
+
+
+def main() -> None:
+    slide_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+    os.chdir(workdir)
+    server = None
+    try:
+        make_project(slide_count)
+        print("Registry: " + str(slide_count) + " slides")
+        # Warm the on-disk registry cache so both sides start from it
+        wall_time_ms(["build"], 1)
+        direct = time_commands(runs)
+
+        server = subprocess.Popen([sys.executable, "-m", "slidedeck.client", "serve"], stdout=subprocess.PIPE)
+        server.stdout.readline()
+        assert os.path.exists(SOCKET_PATH), "server did not start"
+        served = time_commands(runs)
+
+        print("".ljust(24) + "direct".rjust(12) + "served".rjust(12))
+        for label, a, b in zip(["add --journal", "build"], direct, served):
+            print(label.ljust(24) + (str(round(a)) + " ms").rjust(12) + (str(round(b)) + " ms").rjust(12))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark 'slidedeck add --stdin' throughput for decks of different sizes.
+
+Pipes RECORD_COUNT NDJSON records into one 'slidedeck add --stdin' process
+per deck size and reports records per second, including process start-up
+and the one-time registry load.
+
+Usage: python benchmarks/bench_stdin_ingest.py [RECORD_COUNT]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import make_registry, topic_ids, write_registry
+
+DECK_SIZES = [1000, 10000, 50000]
+
+
+def make_project(slide_count: int, record_count: int) -> bytes:
+    """Write slides.yaml and the figure files; return the NDJSON input."""
+    write_registry(make_registry(slide_count, topic_ids(10)))
+
+    records = []
+    for t in range(10):
+        Path("figures/topic_" + str(t)).mkdir(parents=True)
+    for i in range(record_count):
+        path = "figures/topic_" + str(i % 10) + "/step_" + str(i) + ".png"
+        Path(path).write_bytes(b"")
+        records.append(json.dumps({"path": path, "caption": "Step " + str(i), "tags": ["sweep"]}))
+    return ("\n".join(records) + "\n").encode("utf-8")
+
+
+def main() -> None:
+    record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("Ingesting " + str(record_count) + " records per deck size")
+    for slide_count in DECK_SIZES:
+        workdir = tempfile.mkdtemp(prefix="slidedeck_bench_")
+        os.chdir(workdir)
+        try:
+            records = make_project(slide_count, record_count)
+            # Warm the registry cache, as in a project that has been built before
+            subprocess.run([sys.executable, "-m", "slidedeck.cli", "build"], capture_output=True, check=True)
+            start = time.perf_counter()
+            command = [sys.executable, "-m", "slidedeck.cli", "add", "--stdin"]
+            subprocess.run(command, input=records, capture_output=True, check=True)
+            elapsed = time.perf_counter() - start
+            rate = str(round(record_count / elapsed)) + " records/s"
+            label = "deck of " + str(slide_count)
+            print(label.ljust(20) + str(round(elapsed * 1000)).rjust(8) + " ms" + rate.rjust(22))
+        finally:
+            os.chdir("/")
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
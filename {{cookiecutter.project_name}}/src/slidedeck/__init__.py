@@ -1,3 +1,20 @@
 """Slidedeck CLI tool for managing research slide decks."""
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # Imported on first use so the CLI does not pay for the Python API
+    if name == "Deck":
+        from slidedeck.deck import Deck
+
+        return Deck
+    if name == "FigureError":
+        from slidedeck.add import FigureError
+
+        return FigureError
+    if name == "savefig":
+        from slidedeck.writer import savefig
+
+        return savefig
+    raise AttributeError("module 'slidedeck' has no attribute '" + name + "'")
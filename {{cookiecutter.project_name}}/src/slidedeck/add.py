@@ -1,23 +1,21 @@
 """Add figures to the slide deck."""
 
+import glob
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
 import click
-import yaml
 
+from slidedeck import store
+from slidedeck.registry import append_journal, load_registry, load_slide_index, save_registry, unique_slide_id
 
-def load_registry(path: Path = Path("slides.yaml")) -> dict:
-    """Load the slides registry."""
-    with open(path) as f:
-        return yaml.safe_load(f)
+FIGURE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".pdf", ".webp"}
 
 
-def save_registry(data: dict, path: Path = Path("slides.yaml")) -> None:
-    """Save the slides registry."""
-    with open(path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+class FigureError(ValueError):
+    """A figure or topic that cannot be added; the message says why."""
 
 
 def infer_topic_from_path(figure_path: Path) -> str | None:
@@ -44,91 +42,220 @@ def generate_slide_id(title: str, created: str) -> str:
     return created + "_" + slug
 
 
-def add_figure(
-    figure_path: str,
-    topic: str | None = None,
-    title: str | None = None,
-    caption: str = "",
-    notes: str = "",
-    tags: list[str] | None = None,
-    copy_file: bool = False,
-) -> None:
-    """Add a figure to the slide deck registry."""
-    tags = tags or []
-    source_path = Path(figure_path)
-    registry = load_registry()
+def expand_figure_paths(patterns: list[str]) -> list[Path]:
+    """Expand paths, globs and directories into a de-duplicated list of figure files."""
+    figure_paths: list[Path] = []
+    seen: set[Path] = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if glob.has_magic(pattern):
+            matches = [Path(m) for m in sorted(glob.glob(pattern, recursive=True))]
+            matches = [m for m in matches if m.is_file() and m.suffix.lower() in FIGURE_EXTENSIONS]
+        elif path.is_dir():
+            matches = sorted(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in FIGURE_EXTENSIONS)
+        elif path.exists():
+            matches = [path]
+        else:
+            raise FigureError("Path '" + pattern + "' does not exist.")
 
-    # Get valid topic IDs
-    valid_topics = {t["id"] for t in registry["topics"]}
+        if not matches:
+            raise FigureError("No figures found for '" + pattern + "'.")
 
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                figure_paths.append(match)
+    return figure_paths
+
+
+def resolve_topic(source_path: Path, topic: str | None, valid_topics: set[str]) -> str:
+    """Return the explicit or inferred topic for a figure, or raise FigureError if it is invalid."""
+    listing = "\nValid topics: " + ", ".join(valid_topics)
     # Infer topic if not provided
     if topic is None:
         topic = infer_topic_from_path(source_path)
         if topic is None:
-            click.echo("Error: Could not infer topic from path. Please specify --topic.", err=True)
-            click.echo("Valid topics: " + ", ".join(valid_topics), err=True)
-            raise SystemExit(1)
+            raise FigureError(
+                "Could not infer topic from path '" + str(source_path) + "'. Please specify --topic." + listing
+            )
 
     # Validate topic
     if topic not in valid_topics:
-        click.echo("Error: Unknown topic '" + topic + "'.", err=True)
-        click.echo("Valid topics: " + ", ".join(valid_topics), err=True)
-        raise SystemExit(1)
+        raise FigureError("Unknown topic '" + topic + "'." + listing)
+    return topic
 
-    # Infer title if not provided
-    if title is None:
-        title = infer_title_from_filename(source_path)
 
-    # Handle file copying
-    if copy_file:
-        dest_dir = Path("figures") / topic
+def _copy_figures(copies: list[tuple[Path, Path]]) -> None:
+    """Copy figure files into figures/<topic>/, in parallel for large batches."""
+    copies = [(source, dest) for source, dest in copies if not (dest.exists() and dest.samefile(source))]
+    if not copies:
+        return
+    for dest_dir in {dest.parent for _, dest in copies}:
         dest_dir.mkdir(parents=True, exist_ok=True)
-        dest_path = dest_dir / source_path.name
-        shutil.copy2(source_path, dest_path)
-        figure_rel_path = str(dest_path)
-        click.echo("Copied " + str(source_path) + " -> " + str(dest_path))
-    else:
-        figure_rel_path = str(source_path)
+    with ThreadPoolExecutor(max_workers=min(8, len(copies))) as pool:
+        # list() re-raises the first copy error, if any
+        list(pool.map(lambda pair: shutil.copy2(*pair), copies))
 
-    # Generate slide ID and metadata
+
+def copy_into_figures(sources: list[Path], topics: list[str]) -> list[Path]:
+    """Copy figures into figures/<topic>/ and return their destinations.
+
+    Raises FigureError, before copying anything, if two would collide.
+    """
+    copies = [(source, Path("figures") / t / source.name) for source, t in zip(sources, topics)]
+    destinations: dict[Path, Path] = {}
+    for source, dest in copies:
+        if dest in destinations:
+            raise FigureError(
+                str(source) + " and " + str(destinations[dest]) + "\nwould both be copied to " + str(dest)
+            )
+        destinations[dest] = source
+    _copy_figures(copies)
+    return [dest for _, dest in copies]
+
+
+def new_slide_entries(
+    sources: list[Path],
+    topics: list[str],
+    figure_paths: list[str],
+    existing_ids: set[str],
+    title: str | None = None,
+    caption: str = "",
+    notes: str = "",
+    tags: list[str] | None = None,
+) -> list[dict]:
+    """Slide entries created today for the given figures.
+
+    IDs are made unique against existing_ids, which is updated with the new IDs.
+    """
     created = date.today().isoformat()
-    slide_id = generate_slide_id(title, created)
-
-    # Check for duplicate ID
-    existing_ids = {s["id"] for s in registry.get("slides", [])}
-    if slide_id in existing_ids:
-        # Append a counter to make unique
-        counter = 2
-        while slide_id + "_" + str(counter) in existing_ids:
-            counter += 1
-        slide_id = slide_id + "_" + str(counter)
-
-    # Create slide entry
-    slide_entry = {
-        "id": slide_id,
-        "topic": topic,
-        "title": title,
-        "caption": caption,
-        "notes": notes,
-        "figure": figure_rel_path,
-        "created": created,
-        "tags": tags,
-    }
-
-    # Add to registry
-    if "slides" not in registry:
-        registry["slides"] = []
-    registry["slides"].append(slide_entry)
-
-    save_registry(registry)
-
-    click.echo("Added slide: " + title)
-    click.echo("  ID: " + slide_id)
-    click.echo("  Topic: " + topic)
-    click.echo("  Figure: " + figure_rel_path)
-    if caption:
-        click.echo("  Caption: " + caption)
-    click.echo("  Created: " + created)
-    if tags:
-        click.echo("  Tags: " + ", ".join(tags))
+    entries = []
+    for source, slide_topic, figure_path in zip(sources, topics, figure_paths):
+        slide_title = title if title is not None else infer_title_from_filename(source)
+        slide_id = unique_slide_id(generate_slide_id(slide_title, created), existing_ids)
+        existing_ids.add(slide_id)
+        entries.append({
+            "id": slide_id,
+            "topic": slide_topic,
+            "title": slide_title,
+            "caption": caption,
+            "notes": notes,
+            "figure": figure_path,
+            "created": created,
+            "tags": list(tags or []),
+        })
+    return entries
+
+
+def add_figures(
+    figure_paths: list[str],
+    topic: str | None = None,
+    title: str | None = None,
+    caption: str = "",
+    notes: str = "",
+    tags: list[str] | None = None,
+    copy_file: bool = False,
+    journal: bool = False,
+) -> list[dict]:
+    """Add many figures to the slide deck registry in one load and save.
+
+    figure_paths may contain file paths, glob patterns and directories. Topic and
+    title are inferred per figure unless given. Returns the new slide entries.
+    When slides.db exists the entries are inserted there instead. Invalid
+    figures or topics raise FigureError before anything is written.
+    """
+    tags = tags or []
+    sources = expand_figure_paths(figure_paths)
+    if title is not None and len(sources) > 1:
+        raise FigureError("--title can only be used when adding a single figure.")
+
+    conn = store.connect() if store.is_enabled() else None
+    try:
+        if conn is not None:
+            registry = store.load_meta(conn)
+            existing_ids = store.SlideIdLookup(conn)
+        elif journal:
+            # Appending needs only the topics and slide IDs, not the slides themselves
+            registry_topics, existing_ids = load_slide_index()
+            registry = {"topics": registry_topics}
+        else:
+            registry = load_registry()
+            existing_ids = {s["id"] for s in registry.get("slides", [])}
+
+        # Get valid topic IDs
+        valid_topics = {t["id"] for t in registry["topics"]}
+
+        # Validate everything before touching the filesystem or the registry
+        topics = [resolve_topic(source, topic, valid_topics) for source in sources]
+
+        # Handle file copying
+        figure_rel_paths = [str(source) for source in sources]
+        if copy_file:
+            destinations = copy_into_figures(sources, topics)
+            figure_rel_paths = [str(dest) for dest in destinations]
+            for source, dest in zip(sources, destinations):
+                click.echo("Copied " + str(source) + " -> " + str(dest))
+
+        # Generate slide IDs and metadata
+        entries = new_slide_entries(sources, topics, figure_rel_paths, existing_ids, title, caption, notes, tags)
+
+        # Add to registry
+        if conn is not None:
+            with conn:
+                store.insert_slides(conn, entries)
+        elif journal:
+            append_journal(entries)
+        else:
+            if "slides" not in registry:
+                registry["slides"] = []
+            registry["slides"].extend(entries)
+            # A sharded registry only rewrites the shards of the topics that changed
+            save_registry(registry, topics=set(topics))
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if len(entries) == 1:
+        entry = entries[0]
+        click.echo("Added slide: " + entry["title"])
+        click.echo("  ID: " + entry["id"])
+        click.echo("  Topic: " + entry["topic"])
+        click.echo("  Figure: " + entry["figure"])
+        if caption:
+            click.echo("  Caption: " + caption)
+        click.echo("  Created: " + entry["created"])
+        if tags:
+            click.echo("  Tags: " + ", ".join(tags))
+    else:
+        for entry in entries:
+            click.echo("Added slide: " + entry["title"] + " (" + entry["topic"] + ", " + entry["id"] + ")")
+        click.echo("\nAdded " + str(len(entries)) + " slides")
     click.echo("\nRun 'slidedeck build' to regenerate QMD files.")
+    return entries
+
+
+def add_figure(
+    figure_path: str,
+    topic: str | None = None,
+    title: str | None = None,
+    caption: str = "",
+    notes: str = "",
+    tags: list[str] | None = None,
+    copy_file: bool = False,
+    journal: bool = False,
+) -> None:
+    """Add a figure to the slide deck registry.
+
+    With journal=True the entry is appended to slides.journal instead of
+    rewriting slides.yaml; run 'slidedeck compact' to fold it back in.
+    """
+    add_figures(
+        [figure_path],
+        topic=topic,
+        title=title,
+        caption=caption,
+        notes=notes,
+        tags=tags,
+        copy_file=copy_file,
+        journal=journal,
+    )
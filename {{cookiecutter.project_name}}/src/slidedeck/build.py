@@ -1,15 +1,27 @@
 """Build QMD files from the slides registry."""
 
+import filecmp
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import click
 import yaml
 
+from slidedeck import registry as registry_module
+from slidedeck import store
+from slidedeck.registry import CACHE_DIR, ensure_cache_dir, load_registry, temporary_sibling, write_atomic
 
-def load_registry(path: Path = Path("slides.yaml")) -> dict:
-    """Load the slides registry."""
-    with open(path) as f:
-        return yaml.safe_load(f)
+OUTPUT_DIGESTS_PATH = CACHE_DIR / "outputs.json"
+QUARTO_CONFIG_PATH = Path("_quarto.yml")
+
+# Below this many slides, starting worker processes and pickling slides to them
+# costs more than rendering serially, so --jobs falls back to one process
+PARALLEL_MIN_SLIDES = 20000
 
 
 def _render_slide(slide: dict, lines: list[str]) -> None:
@@ -49,10 +61,37 @@ def _render_slide(slide: dict, lines: list[str]) -> None:
         ])
 
 
-def build_slides_qmd(registry: dict) -> str:
-    """Generate the main slides.qmd content."""
-    title = registry.get("title", "Research Figures")
-    lines = [
+def group_slides_by_topic(registry: dict) -> list[tuple[str, list[dict]]]:
+    """Group slides by topic, ordered by topic order and newest first within each topic."""
+    topic_order = {t["id"]: t["order"] for t in registry["topics"]}
+
+    slides_by_topic: dict[str, list] = {}
+    for slide in registry.get("slides", []):
+        topic_id = slide["topic"]
+        if topic_id not in slides_by_topic:
+            slides_by_topic[topic_id] = []
+        slides_by_topic[topic_id].append(slide)
+
+    # Sort topics by order
+    sorted_topic_ids = sorted(slides_by_topic.keys(), key=lambda x: topic_order.get(x, 999))
+
+    # Sort slides by date (newest first within topic)
+    return [
+        (topic_id, sorted(slides_by_topic[topic_id], key=lambda s: s["created"], reverse=True))
+        for topic_id in sorted_topic_ids
+    ]
+
+
+def _line_chunks(groups: Iterable[list[str]]) -> Iterator[str]:
+    """Join groups of lines with newlines, yielding one chunk per group."""
+    separator = ""
+    for lines in groups:
+        yield separator + "\n".join(lines)
+        separator = "\n"
+
+
+def _deck_header(title: str) -> list[str]:
+    return [
         "---",
         'title: "' + title + '"',
         "format:",
@@ -67,58 +106,150 @@ def build_slides_qmd(registry: dict) -> str:
         "",
     ]
 
-    slides = registry.get("slides", [])
-    if not slides:
-        lines.extend([
-            "# Welcome",
-            "",
-            "No figures added yet.",
-            "",
-            "Run `slidedeck add` to add your first figure.",
-        ])
-        return "\n".join(lines)
 
-    # Group slides by topic
-    topics = {t["id"]: t for t in registry["topics"]}
-    topic_order = {t["id"]: t["order"] for t in registry["topics"]}
+def _topic_name(topics: dict[str, dict], topic_id: str) -> str:
+    return topics.get(topic_id, {"name": topic_id.replace("_", " ").title()})["name"]
 
-    slides_by_topic: dict[str, list] = {}
-    for slide in slides:
-        topic_id = slide["topic"]
-        if topic_id not in slides_by_topic:
-            slides_by_topic[topic_id] = []
-        slides_by_topic[topic_id].append(slide)
 
-    # Sort topics by order
-    sorted_topic_ids = sorted(slides_by_topic.keys(), key=lambda x: topic_order.get(x, 999))
+_WELCOME_LINES = [
+    "# Welcome",
+    "",
+    "No figures added yet.",
+    "",
+    "Run `slidedeck add` to add your first figure.",
+]
 
-    for topic_id in sorted_topic_ids:
-        topic = topics.get(topic_id, {"name": topic_id.replace("_", " ").title()})
-        topic_slides = slides_by_topic[topic_id]
 
-        # Sort slides by date (newest first within topic)
-        topic_slides.sort(key=lambda s: s["created"], reverse=True)
+def _topic_groups(topic_id: str, name: str, topic_slides: list[dict]) -> Iterator[list[str]]:
+    # Topic header
+    anchor = topic_id.replace("_", "-")
+    yield [
+        "# " + name + " " + "{" + "#" + anchor + "}",
+        "",
+    ]
 
-        # Topic header
-        anchor = topic_id.replace("_", "-")
-        lines.extend([
-            "# " + topic["name"] + " " + "{" + "#" + anchor + "}",
+    for slide in topic_slides:
+        lines = [
+            "## " + slide["title"] + " " + "{" + "#" + slide["id"] + "}",
             "",
-        ])
+        ]
+        _render_slide(slide, lines)
+        yield lines
 
-        for slide in topic_slides:
-            lines.extend([
-                "## " + slide["title"] + " " + "{" + "#" + slide["id"] + "}",
-                "",
-            ])
-            _render_slide(slide, lines)
 
-    return "\n".join(lines)
+def _render_topic_section(work: tuple[str, str, list[dict]]) -> str:
+    """Render one topic's header and slides. Runs in a worker process for parallel builds."""
+    topic_id, name, topic_slides = work
+    return "".join(_line_chunks(_topic_groups(topic_id, name, topic_slides)))
 
 
-def build_recent_qmd(registry: dict, count: int = 10) -> str:
-    """Generate the recent.qmd content showing most recent figures."""
-    lines = [
+def _slides_qmd_groups(
+    title: str,
+    topic_list: list[dict],
+    sections: Iterable[tuple[str, list[dict]]],
+) -> Iterator[list[str]]:
+    yield _deck_header(title)
+
+    topics = {t["id"]: t for t in topic_list}
+    has_slides = False
+    for topic_id, topic_slides in sections:
+        has_slides = True
+        yield from _topic_groups(topic_id, _topic_name(topics, topic_id), topic_slides)
+
+    if not has_slides:
+        yield _WELCOME_LINES
+
+
+def _pool_size(jobs: int, work_count: int, slide_count: int) -> int:
+    """Number of processes worth rendering work_count items in; 1 means render serially."""
+    if slide_count < PARALLEL_MIN_SLIDES:
+        return 1
+    return max(1, min(jobs, work_count, os.cpu_count() or 1))
+
+
+def _render_map(render, work: list, workers: int) -> Iterator[str]:
+    """render(item) for each work item, in order, in a process pool when workers > 1."""
+    if workers <= 1:
+        yield from map(render, work)
+        return
+    # map() returns results in submission order, so the output is deterministic
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render, work, chunksize=max(1, len(work) // (workers * 4)))
+
+
+def _iter_slides_qmd_parallel(
+    title: str,
+    topic_list: list[dict],
+    sections: Iterable[tuple[str, list[dict]]],
+    jobs: int,
+) -> Iterator[str]:
+    yield "\n".join(_deck_header(title))
+
+    topics = {t["id"]: t for t in topic_list}
+    work = [(topic_id, _topic_name(topics, topic_id), topic_slides) for topic_id, topic_slides in sections]
+    if not work:
+        yield "\n" + "\n".join(_WELCOME_LINES)
+        return
+
+    workers = _pool_size(jobs, len(work), sum(len(item[2]) for item in work))
+    for text in _render_map(_render_topic_section, work, workers):
+        yield "\n" + text
+
+
+def iter_slides_qmd(
+    title: str,
+    topic_list: list[dict],
+    sections: Iterable[tuple[str, list[dict]]],
+    jobs: int = 1,
+) -> Iterator[str]:
+    """Yield slides.qmd content chunk by chunk from (topic_id, slides) sections in display order.
+
+    With jobs > 1 each topic arrives as a single chunk, in the same order,
+    rendered in a process pool if the deck has at least PARALLEL_MIN_SLIDES
+    slides.
+    """
+    if jobs > 1:
+        return _iter_slides_qmd_parallel(title, topic_list, sections, jobs)
+    return _line_chunks(_slides_qmd_groups(title, topic_list, sections))
+
+
+def render_slides_qmd(title: str, topic_list: list[dict], sections: Iterable[tuple[str, list[dict]]]) -> str:
+    """Generate slides.qmd content from (topic_id, slides) sections in display order."""
+    return "".join(iter_slides_qmd(title, topic_list, sections))
+
+
+def topic_deck_path(topic_id: str) -> Path:
+    """File name of the standalone deck for one topic in a split build."""
+    return Path("slides-" + topic_id.replace("_", "-") + ".qmd")
+
+
+def _index_qmd_groups(title: str, decks: list[tuple[str, Path, int]]) -> Iterator[list[str]]:
+    yield _deck_header(title)
+
+    if not decks:
+        yield _WELCOME_LINES
+        return
+
+    lines = ["# Topics", ""]
+    for name, path, count in decks:
+        lines.append("- [" + name + "](" + str(path) + ") (" + str(count) + " slides)")
+    lines.append("")
+    yield lines
+
+
+def iter_index_qmd(title: str, decks: list[tuple[str, Path, int]]) -> Iterator[str]:
+    """Yield a light slides.qmd linking to per-topic decks, given (name, path, slide count) entries."""
+    return _line_chunks(_index_qmd_groups(title, decks))
+
+
+def build_slides_qmd(registry: dict) -> str:
+    """Generate the main slides.qmd content."""
+    title = registry.get("title", "Research Figures")
+    return render_slides_qmd(title, registry["topics"], group_slides_by_topic(registry))
+
+
+def _recent_qmd_groups(recent_slides: list[dict], deck_empty: bool) -> Iterator[list[str]]:
+    yield [
         "---",
         'title: "Recent Figures"',
         "format:",
@@ -131,32 +262,50 @@ def build_recent_qmd(registry: dict, count: int = 10) -> str:
         "",
     ]
 
-    slides = registry.get("slides", [])
-    if not slides:
-        lines.extend([
+    if deck_empty:
+        yield [
             "# Recent Figures",
             "",
             "No figures added yet.",
             "",
             "Run `slidedeck add` to add your first figure.",
-        ])
-        return "\n".join(lines)
-
-    # Sort all slides by date (newest first)
-    sorted_slides = sorted(slides, key=lambda s: s["created"], reverse=True)
-    recent_slides = sorted_slides[:count]
-
-    # Get topic names for display
-    topics = {t["id"]: t["name"] for t in registry["topics"]}
+        ]
+        return
 
     for slide in recent_slides:
-        lines.extend([
+        lines = [
             "## " + slide["title"],
             "",
-        ])
+        ]
         _render_slide(slide, lines)
+        yield lines
+
+
+def iter_recent_qmd(recent_slides: list[dict], deck_empty: bool | None = None) -> Iterator[str]:
+    """Yield recent.qmd content chunk by chunk from slides already sorted newest first.
+
+    deck_empty defaults to whether recent_slides is empty; pass it explicitly
+    when a zero count may have left recent_slides empty for a non-empty deck.
+    """
+    if deck_empty is None:
+        deck_empty = not recent_slides
+    return _line_chunks(_recent_qmd_groups(recent_slides, deck_empty))
+
 
-    return "\n".join(lines)
+def render_recent_qmd(recent_slides: list[dict], deck_empty: bool | None = None) -> str:
+    """Generate recent.qmd content from slides already sorted newest first."""
+    return "".join(iter_recent_qmd(recent_slides, deck_empty))
+
+
+def _most_recent(registry: dict, count: int) -> list[dict]:
+    # Sort all slides by date (newest first)
+    sorted_slides = sorted(registry.get("slides", []), key=lambda s: s["created"], reverse=True)
+    return sorted_slides[:count]
+
+
+def build_recent_qmd(registry: dict, count: int = 10) -> str:
+    """Generate the recent.qmd content showing most recent figures."""
+    return render_recent_qmd(_most_recent(registry, count), deck_empty=not registry.get("slides"))
 
 
 def build_styles_css() -> str:
@@ -222,24 +371,294 @@ def build_styles_css() -> str:
 """
 
 
-def build_slides(recent_count: int = 10) -> None:
-    """Build all QMD files from the registry."""
-    registry = load_registry()
-
-    # Build slides.qmd
-    slides_content = build_slides_qmd(registry)
-    Path("slides.qmd").write_text(slides_content)
-    click.echo("Generated slides.qmd")
-
-    # Build recent.qmd
-    recent_content = build_recent_qmd(registry, count=recent_count)
-    Path("recent.qmd").write_text(recent_content)
-    click.echo("Generated recent.qmd")
-
-    # Build styles.css
-    styles_content = build_styles_css()
-    Path("styles.css").write_text(styles_content)
-    click.echo("Generated styles.css")
-
+def _load_output_digests() -> dict:
+    try:
+        with open(OUTPUT_DIGESTS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_output_digests(digests: dict) -> None:
+    try:
+        ensure_cache_dir()
+        write_atomic(OUTPUT_DIGESTS_PATH, json.dumps(digests, indent=1, sort_keys=True).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def write_if_changed(path: Path, chunks: Iterable[str], digests: dict) -> bool:
+    """Stream chunks to path atomically unless the file already holds exactly that content.
+
+    The content is written to a temporary file next to path while it is being
+    hashed, so it is never held in memory as a whole. digests maps outputs to
+    the digest, size and mtime recorded when they were last written, so an
+    unchanged output is detected without reading it back. Returns True if path
+    was replaced.
+    """
+    tmp_path = temporary_sibling(path)
+    try:
+        hasher = hashlib.sha256()
+        with open(tmp_path, "wb", buffering=1024 * 1024) as f:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                hasher.update(data)
+                f.write(data)
+        digest = hasher.hexdigest()
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        if stat is not None:
+            record = digests.get(str(path))
+            unchanged_since_build = (
+                record is not None and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns
+            )
+            if unchanged_since_build:
+                same = record["digest"] == digest
+            else:
+                # Edited by hand or never recorded: compare the actual bytes
+                same = filecmp.cmp(tmp_path, path, shallow=False)
+            if same:
+                tmp_path.unlink()
+                digests[str(path)] = {"digest": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                return False
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        # E.g. a malformed slide raising while the chunks are generated
+        tmp_path.unlink(missing_ok=True)
+        raise
+    stat = path.stat()
+    digests[str(path)] = {"digest": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return True
+
+
+def _mapping_value(node, key: str):
+    """The value node under key in a composed YAML mapping, or None."""
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            if isinstance(key_node, yaml.ScalarNode) and key_node.value == key:
+                return value_node
+    return None
+
+
+def _node_end(node) -> int:
+    """Offset just past a node's last character; block collections otherwise end where the next line starts."""
+    if isinstance(node, yaml.ScalarNode) or node.flow_style or not node.value:
+        return node.end_mark.index
+    last = node.value[-1]
+    return _node_end(last[1] if isinstance(node, yaml.MappingNode) else last)
+
+
+def update_quarto_navbar(decks: list[tuple[str, Path, int]], digests: dict) -> bool:
+    """Point the navbar's Slides entry at the per-topic decks, or back at slides.qmd if there are none.
+
+    Only the text of that navbar entry is replaced, so comments, quoting and
+    key order in the rest of _quarto.yml are kept. Returns True if the file
+    was rewritten. Configs without a navbar entry linking slides.qmd are
+    left alone.
+    """
+    try:
+        source = QUARTO_CONFIG_PATH.read_text()
+        config = yaml.safe_load(source)
+        navbar = _mapping_value(_mapping_value(yaml.compose(source, Loader=yaml.SafeLoader), "website"), "navbar")
+        left_node = _mapping_value(navbar, "left")
+    except (FileNotFoundError, yaml.YAMLError):
+        return False
+    left = (((config or {}).get("website") or {}).get("navbar") or {}).get("left")
+    if not isinstance(left, list) or not isinstance(left_node, yaml.SequenceNode) or len(left_node.value) != len(left):
+        return False
+
+    def links_slides(item) -> bool:
+        if not isinstance(item, dict):
+            return False
+        hrefs = [item.get("href")] + [m.get("href") for m in item.get("menu") or [] if isinstance(m, dict)]
+        return "slides.qmd" in hrefs
+
+    index = next((i for i, item in enumerate(left) if links_slides(item)), None)
+    if index is None:
+        return False
+
+    text = left[index].get("text", "Slides")
+    if decks:
+        menu = [{"text": "All topics", "href": "slides.qmd"}]
+        menu.extend({"text": name, "href": str(path)} for name, path, _ in decks)
+        entry = {"text": text, "menu": menu}
+    else:
+        entry = {"text": text, "href": "slides.qmd"}
+    if left[index] == entry:
+        return False
+    left[index] = entry
+
+    item = left_node.value[index]
+    if left_node.flow_style:
+        rendered = yaml.dump(entry, default_flow_style=True, sort_keys=False, allow_unicode=True, width=1 << 30)
+    else:
+        lines = yaml.dump(entry, default_flow_style=False, sort_keys=False, allow_unicode=True).splitlines()
+        rendered = ("\n" + " " * item.start_mark.column).join(lines)
+    content = source[: item.start_mark.index] + rendered.strip() + source[_node_end(item) :]
+    try:
+        spliced = yaml.safe_load(content)
+    except yaml.YAMLError:
+        spliced = None
+    if spliced != config:
+        click.echo(
+            "Warning: Could not update the navbar in " + str(QUARTO_CONFIG_PATH) + "; link the decks by hand.",
+            err=True,
+        )
+        return False
+    return write_if_changed(QUARTO_CONFIG_PATH, [content], digests)
+
+
+def _render_topic_deck(work: tuple[str, list[dict], str, list[dict]]) -> str:
+    """Render one standalone topic deck. Runs in a worker process for parallel split builds."""
+    title, topic_list, topic_id, topic_slides = work
+    return "".join(iter_slides_qmd(title, topic_list, [(topic_id, topic_slides)]))
+
+
+def _write_topic_decks(
+    title: str,
+    topic_list: list[dict],
+    sections: Iterable[tuple[str, list[dict]]],
+    digests: dict,
+    jobs: int = 1,
+) -> list[tuple[str, Path, int]]:
+    """Write one standalone deck per topic. Returns (name, path, slide count) for each.
+
+    With jobs > 1 the decks are rendered in a process pool if the deck has at
+    least PARALLEL_MIN_SLIDES slides; otherwise each is streamed to disk.
+    """
+    topics = {t["id"]: t for t in topic_list}
+    if jobs > 1:
+        sections = list(sections)
+        workers = _pool_size(jobs, len(sections), sum(len(topic_slides) for _, topic_slides in sections))
+    else:
+        workers = 1
+
+    decks = []
+    named = [(topic_id, _topic_name(topics, topic_id), topic_slides) for topic_id, topic_slides in sections]
+    if workers > 1:
+        work = [(title + ": " + name, topic_list, topic_id, topic_slides) for topic_id, name, topic_slides in named]
+        contents = ([content] for content in _render_map(_render_topic_deck, work, workers))
+    else:
+        contents = (
+            iter_slides_qmd(title + ": " + name, topic_list, [(topic_id, topic_slides)])
+            for topic_id, name, topic_slides in named
+        )
+    for (topic_id, name, topic_slides), chunks in zip(named, contents):
+        path = topic_deck_path(topic_id)
+        click.echo(("Generated " if write_if_changed(path, chunks, digests) else "Unchanged ") + str(path))
+        decks.append((name, path, len(topic_slides)))
+    return decks
+
+
+def _remove_stale_topic_decks(decks: list[tuple[str, Path, int]], digests: dict) -> None:
+    """Delete per-topic decks written by an earlier build that are no longer produced."""
+    current = {str(path) for _, path, _ in decks}
+    for name in list(digests):
+        if name.startswith("slides-") and name.endswith(".qmd") and name not in current:
+            Path(name).unlink(missing_ok=True)
+            del digests[name]
+            click.echo("Removed " + name)
+
+
+def _database_sources(
+    conn: sqlite3.Connection,
+    recent_count: int,
+    topics: set[str] | None,
+    tags: set[str] | None,
+) -> tuple:
+    """Query the SQLite registry indexes for everything a build needs."""
+    if store.yaml_changed_since_sync(conn):
+        click.echo(
+            "Warning: slides.yaml changed since the last 'slidedeck db import'; building from slides.db.",
+            err=True,
+        )
+    meta = store.load_meta(conn)
+    title = meta.get("title", "Research Figures")
+    sections = store.iter_topic_sections(conn, meta["topics"], topics, tags)
+    recent = store.recent_slides(conn, recent_count, topics, tags)
+    slide_count = store.count_slides(conn, topics, tags)
+    topic_count = len(meta["topics"]) if topics is None else len(topics)
+    return title, meta["topics"], sections, recent, slide_count, topic_count
+
+
+def _registry_sources(recent_count: int, topics: set[str] | None, tags: set[str] | None) -> tuple:
+    """Load the YAML registry and derive everything a build needs."""
+    registry_module.reset_parse_stats()
+    registry = load_registry(topics=topics)
+    stats = registry_module.parse_stats
+    click.echo("Loaded registry: " + str(stats["parsed"]) + " slides parsed, " + str(stats["reused"]) + " reused")
+    if tags is not None:
+        registry["slides"] = [s for s in registry.get("slides") or [] if tags.intersection(s.get("tags") or [])]
+    title = registry.get("title", "Research Figures")
     slide_count = len(registry.get("slides", []))
-    click.echo("Build complete: " + str(slide_count) + " slides across " + str(len(registry["topics"])) + " topics")
+    topic_count = len(registry["topics"]) if topics is None else len(topics)
+    recent = _most_recent(registry, recent_count)
+    return title, registry["topics"], group_slides_by_topic(registry), recent, slide_count, topic_count
+
+
+def build_slides(
+    recent_count: int = 10,
+    topics: set[str] | None = None,
+    split: bool = False,
+    jobs: int = 1,
+    tags: set[str] | None = None,
+) -> None:
+    """Build all QMD files from the registry.
+
+    If topics is given, the decks only include slides from those topics and a
+    sharded registry only reads their shards. If tags is given, they only
+    include slides carrying at least one of the tags, looked up through the
+    tag index with the SQLite backend. Output is streamed to disk slide by
+    slide rather than assembled in memory.
+
+    With split=True each topic gets its own deck (slides-<topic>.qmd), slides.qmd
+    becomes a short index linking them, and the _quarto.yml navbar lists them.
+    With jobs > 1 the topic sections of slides.qmd, or the topic decks with
+    split=True, are rendered in a process pool once the deck has at least
+    PARALLEL_MIN_SLIDES slides.
+    """
+    conn = store.connect() if store.is_enabled() else None
+    try:
+        if conn is not None:
+            sources = _database_sources(conn, recent_count, topics, tags)
+        else:
+            sources = _registry_sources(recent_count, topics, tags)
+        title, topic_list, sections, recent, slide_count, topic_count = sources
+
+        # Write the outputs, leaving unchanged files untouched so their mtimes
+        # stay put and quarto preview does not re-render them.
+        digests = _load_output_digests()
+        decks = []
+        if split:
+            decks = _write_topic_decks(title, topic_list, sections, digests, jobs=jobs)
+            slides_chunks = iter_index_qmd(title, decks)
+        else:
+            slides_chunks = iter_slides_qmd(title, topic_list, sections, jobs=jobs)
+
+        outputs = [
+            (Path("slides.qmd"), slides_chunks),
+            (Path("recent.qmd"), iter_recent_qmd(recent, deck_empty=slide_count == 0)),
+            (Path("styles.css"), [build_styles_css()]),
+        ]
+        for path, chunks in outputs:
+            if write_if_changed(path, chunks, digests):
+                click.echo("Generated " + str(path))
+            else:
+                click.echo("Unchanged " + str(path))
+
+        # A filtered build does not know about the other topics' decks
+        if topics is None and tags is None:
+            _remove_stale_topic_decks(decks, digests)
+            if update_quarto_navbar(decks, digests):
+                click.echo("Updated " + str(QUARTO_CONFIG_PATH) + " navbar")
+        _save_output_digests(digests)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    click.echo("Build complete: " + str(slide_count) + " slides across " + str(topic_count) + " topics")
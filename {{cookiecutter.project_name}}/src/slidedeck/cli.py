@@ -1,10 +1,13 @@
-"""CLI interface for the slidedeck tool."""
+"""CLI interface for the slidedeck tool.
 
-import click
+Each command imports its implementation module when it runs, so
+'slidedeck --help', shell completion and quick commands only pay for
+importing click, not yaml, sqlite3 or the git helpers. The slidedeck
+command itself starts in slidedeck.client, which forwards to a running
+'slidedeck serve' before this module is imported at all.
+"""
 
-from slidedeck.add import add_figure
-from slidedeck.build import build_slides
-from slidedeck.history import show_history, generate_comparison
+import click
 
 
 @click.group()
@@ -14,17 +17,46 @@ def cli():
 
 
 @cli.command()
-@click.argument("figure_path", type=click.Path(exists=True))
+@click.argument("figure_paths", nargs=-1)
 @click.option("--topic", "-t", help="Topic ID (inferred from path if not provided)")
-@click.option("--title", "-T", help="Slide title (inferred from filename if not provided)")
+@click.option("--title", "-T", help="Slide title (inferred from filename if not provided; single figure only)")
 @click.option("--caption", "-c", default="", help="Figure caption (appears below the figure)")
 @click.option("--notes", "-n", default="", help="Speaker notes (not visible on slides)")
 @click.option("--tags", help="Comma-separated tags")
 @click.option("--copy", is_flag=True, help="Copy figure to figures/ directory")
-def add(figure_path: str, topic: str | None, title: str | None, caption: str, notes: str, tags: str | None, copy: bool):
-    """Add a new figure to the slide deck.
+@click.option("--journal", is_flag=True, help="Append to slides.journal instead of rewriting slides.yaml")
+@click.option("--stdin", "from_stdin", is_flag=True, help="Read NDJSON slide records from stdin until it closes")
+@click.option(
+    "--batch-size", default=1000, type=click.IntRange(min=1),
+    help="With --stdin, commit at most this many slides at once",
+)
+@click.option(
+    "--batch-seconds", default=1.0, type=click.FloatRange(min=0),
+    help="With --stdin, commit pending slides at least this often",
+)
+def add(
+    figure_paths: tuple[str, ...],
+    topic: str | None,
+    title: str | None,
+    caption: str,
+    notes: str,
+    tags: str | None,
+    copy: bool,
+    journal: bool,
+    from_stdin: bool,
+    batch_size: int,
+    batch_seconds: float,
+):
+    """Add new figures to the slide deck.
 
-    FIGURE_PATH is the path to the figure image file.
+    FIGURE_PATHS are figure image files, glob patterns or directories. All
+    figures are registered with a single load and save of slides.yaml.
+
+    With --stdin, each input line is a JSON record such as
+    {"path": "figures/results/loss.png", "caption": "...", "tags": ["a"]}
+    (optional keys: topic, title, caption, notes, tags). Records are
+    committed to slides.journal, or slides.db, in batches as they arrive;
+    --topic, --caption, --notes and --tags set defaults.
 
     Examples:
 
@@ -33,16 +65,133 @@ def add(figure_path: str, topic: str | None, title: str | None, caption: str, no
         slidedeck add my_plot.png --topic modeling --title "Results" --copy
 
         slidedeck add figures/results/final.png -t results -T "Final Results" -c "Model performance over time"
+
+        slidedeck add figures/results/epoch_12.png --journal
+
+        slidedeck add figures/modeling/ "sweep/**/*.png" --topic modeling --copy
+
+        ./run_sweep.py | slidedeck add --stdin
     """
     tag_list = [t.strip() for t in tags.split(",")] if tags else []
-    add_figure(figure_path, topic=topic, title=title, caption=caption, notes=notes, tags=tag_list, copy_file=copy)
+    if from_stdin:
+        import sys
+
+        from slidedeck.ingest import ingest_records
+
+        if figure_paths or title is not None or copy:
+            click.echo("Error: --stdin cannot be combined with FIGURE_PATHS, --title or --copy.", err=True)
+            raise SystemExit(1)
+        added, rejected = ingest_records(
+            sys.stdin,
+            topic=topic,
+            caption=caption,
+            notes=notes,
+            tags=tag_list,
+            batch_size=batch_size,
+            batch_seconds=batch_seconds,
+        )
+        click.echo("Added " + str(added) + " slides from stdin" + (", rejected " + str(rejected) if rejected else ""))
+        if rejected:
+            raise SystemExit(1)
+        return
+    if not figure_paths:
+        click.echo("Error: Give FIGURE_PATHS or --stdin.", err=True)
+        raise SystemExit(1)
+
+    from slidedeck.add import FigureError, add_figures
+
+    try:
+        add_figures(
+            list(figure_paths),
+            topic=topic,
+            title=title,
+            caption=caption,
+            notes=notes,
+            tags=tag_list,
+            copy_file=copy,
+            journal=journal,
+        )
+    except FigureError as e:
+        click.echo("Error: " + str(e), err=True)
+        raise SystemExit(1)
 
 
 @cli.command()
 @click.option("--recent-count", "-n", default=10, help="Number of recent figures to show")
-def build(recent_count: int):
+@click.option("--topic", "-t", "topics", multiple=True, help="Only include this topic (repeatable)")
+@click.option("--tag", "tags", multiple=True, help="Only include slides with this tag (repeatable: any of them)")
+@click.option("--split", is_flag=True, help="Write one deck per topic plus an index slides.qmd")
+@click.option(
+    "--jobs", "-j", default=1, type=click.IntRange(min=1),
+    help="Render topics in this many processes (large decks only)",
+)
+def build(recent_count: int, topics: tuple[str, ...], tags: tuple[str, ...], split: bool, jobs: int):
     """Build/regenerate all QMD files from slides.yaml."""
-    build_slides(recent_count=recent_count)
+    from slidedeck.build import build_slides
+
+    build_slides(recent_count=recent_count, topics=set(topics) or None, split=split, jobs=jobs, tags=set(tags) or None)
+
+
+@cli.command()
+def compact():
+    """Fold journaled slides from slides.journal back into slides.yaml."""
+    from slidedeck.registry import compact_registry
+
+    count = compact_registry()
+    if count:
+        click.echo("Compacted " + str(count) + " journaled slide(s) into slides.yaml")
+    else:
+        click.echo("Journal is empty. Nothing to compact.")
+
+
+@cli.command()
+@click.option("--merge", is_flag=True, help="Merge slides.d/ back into a single slides.yaml")
+def shard(merge: bool):
+    """Split slides.yaml into per-topic files under slides.d/.
+
+    slides.yaml keeps the title and topics; each topic's slides move to
+    slides.d/<topic>.yaml, so adding a figure rewrites only that file.
+    """
+    from slidedeck.registry import shard_registry, unshard_registry
+
+    if merge:
+        count = unshard_registry()
+        click.echo("Merged " + str(count) + " slides back into slides.yaml")
+    else:
+        count = shard_registry()
+        click.echo("Wrote " + str(count) + " topic shard(s) to slides.d/")
+
+
+@cli.group()
+def db():
+    """Manage the optional SQLite registry (slides.db)."""
+    pass
+
+
+@db.command("import")
+def db_import():
+    """Load slides.yaml into slides.db and switch the project to the SQLite backend."""
+    from slidedeck import store
+
+    try:
+        count = store.import_yaml()
+    except store.DuplicateSlideIdError as e:
+        click.echo("Error: " + str(e), err=True)
+        click.echo("Give each slide a unique ID in slides.yaml, then import again.", err=True)
+        raise SystemExit(1)
+    click.echo("Imported " + str(count) + " slides into " + str(store.DB_PATH))
+
+
+@db.command("export")
+def db_export():
+    """Write the contents of slides.db back to slides.yaml."""
+    from slidedeck import store
+
+    if not store.is_enabled():
+        click.echo("Error: " + str(store.DB_PATH) + " does not exist. Run 'slidedeck db import' first.", err=True)
+        raise SystemExit(1)
+    count = store.export_yaml()
+    click.echo("Exported " + str(count) + " slides to slides.yaml")
 
 
 @cli.command()
@@ -50,11 +199,34 @@ def preview():
     """Build and preview the slides."""
     import subprocess
 
+    from slidedeck.build import build_slides
+
     build_slides()
     click.echo("Starting Quarto preview...")
     subprocess.run(["quarto", "preview"], check=True)
 
 
+@cli.command()
+@click.option("--stop", is_flag=True, help="Stop the server running for this project")
+def serve(stop: bool):
+    """Run commands for this project in a warm background process.
+
+    While the server runs, slidedeck commands started in this directory are
+    forwarded to it over .slidedeck/serve.sock, so they skip Python start-up
+    and re-reading the registry. Set SLIDEDECK_NO_SERVER=1 to run a command
+    without it.
+    """
+    from slidedeck.server import serve as run_server
+    from slidedeck.server import stop_server
+
+    if not stop:
+        run_server()
+    elif stop_server():
+        click.echo("Stopped slidedeck serve.")
+    else:
+        click.echo("slidedeck serve is not running for this project.")
+
+
 @cli.command()
 @click.argument("figure_path", type=click.Path(exists=True))
 def history(figure_path: str):
@@ -62,18 +234,54 @@ def history(figure_path: str):
 
     FIGURE_PATH is the path to the figure image file.
     """
+    from slidedeck.history import show_history
+
     show_history(figure_path)
 
 
 @cli.command()
-@click.argument("figure_path", type=click.Path(exists=True))
-@click.option("--output", "-o", default="comparison.html", help="Output HTML file")
-def compare(figure_path: str, output: str):
+@click.argument("figure_path", type=click.Path(exists=True), required=False)
+@click.option("--all", "all_figures", is_flag=True, help="Compare every figure in slides.yaml into a directory")
+@click.option(
+    "--output", "-o",
+    help="Output HTML file, or directory with --all [default: comparison.html, comparisons]",
+)
+@click.option("--assets", is_flag=True, help="Write versions as image files next to the HTML instead of embedding them")
+@click.option("--diff", is_flag=True, help="Show a heatmap of changed pixels between consecutive versions")
+@click.option(
+    "--jobs", "-j", default=1, type=click.IntRange(min=1),
+    help="Compute diffs in this many processes (with --all, write this many pages at once)",
+)
+@click.option("--cluster", is_flag=True, help="Show one card per group of perceptually similar versions")
+def compare(
+    figure_path: str | None,
+    all_figures: bool,
+    output: str | None,
+    assets: bool,
+    diff: bool,
+    jobs: int,
+    cluster: bool,
+):
     """Generate comparison view of figure versions from git history.
 
-    FIGURE_PATH is the path to the figure image file.
+    FIGURE_PATH is the path to the figure image file. With --all, every
+    figure in the registry gets a page, linked from an index.html.
     """
-    generate_comparison(figure_path, output)
+    from pathlib import Path
+
+    from slidedeck.history import generate_all_comparisons, generate_comparison
+
+    if all_figures == (figure_path is not None):
+        click.echo("Error: Give either FIGURE_PATH or --all.", err=True)
+        raise SystemExit(1)
+    if all_figures:
+        generate_all_comparisons(
+            Path(output or "comparisons"), external_assets=assets, diff=diff, jobs=jobs, cluster=cluster
+        )
+        return
+    generate_comparison(
+        figure_path, output or "comparison.html", external_assets=assets, diff=diff, jobs=jobs, cluster=cluster
+    )
 
 
 if __name__ == "__main__":
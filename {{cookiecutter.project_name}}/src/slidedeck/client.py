@@ -0,0 +1,94 @@
+"""Entry point of the slidedeck command: forwards to slidedeck serve when it is running.
+
+Only the standard library is imported here, so a forwarded command costs an
+interpreter start and a socket round trip while the command itself runs in
+the server's warm process. Without a server, the click CLI runs in-process.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SOCKET_PATH = os.path.join(".slidedeck", "serve.sock")
+
+# Commands that always run in the calling process: serve itself, and preview,
+# which keeps Quarto running in the foreground
+LOCAL_COMMANDS = {"serve", "preview"}
+
+
+def connect() -> socket.socket | None:
+    """Connect to the server of the project in the current directory, or None if none is running."""
+    if not os.path.exists(SOCKET_PATH):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def send_request(sock: socket.socket, request: dict) -> None:
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a command in the server, relaying its output as it is written.
+
+    Returns the command's exit code, or None if no server is available or it
+    serves another directory; the caller then runs the command itself.
+    """
+    sock = connect()
+    if sock is None:
+        return None
+    try:
+        with sock:
+            send_request(sock, {"argv": argv, "cwd": os.getcwd()})
+            for line in sock.makefile("rb"):
+                message = json.loads(line)
+                if "stdout" in message:
+                    sys.stdout.write(message["stdout"])
+                    sys.stdout.flush()
+                elif "stderr" in message:
+                    sys.stderr.write(message["stderr"])
+                    sys.stderr.flush()
+                elif "exit_code" in message:
+                    return message["exit_code"]
+                elif "refused" in message:
+                    return None
+    except BrokenPipeError:
+        # Our own output was closed, e.g. piped into head
+        return 1
+    except (OSError, ValueError):
+        pass
+    # The command may have run partially, so it is not retried locally
+    sys.stderr.write("Error: Lost connection to slidedeck serve.\n")
+    return 1
+
+
+def _forwardable(argv: list[str]) -> bool:
+    if not argv or argv[0].startswith("-") or argv[0] in LOCAL_COMMANDS:
+        return False
+    # The server cannot read this process's stdin
+    if "--stdin" in argv:
+        return False
+    return not os.environ.get("SLIDEDECK_NO_SERVER")
+
+
+def main() -> None:
+    """Run a slidedeck command, in slidedeck serve if one is running for this directory."""
+    argv = sys.argv[1:]
+    if _forwardable(argv):
+        exit_code = forward(argv)
+        if exit_code is not None:
+            raise SystemExit(exit_code)
+
+    from slidedeck.cli import cli
+
+    cli()
+
+
+if __name__ == "__main__":
+    main()
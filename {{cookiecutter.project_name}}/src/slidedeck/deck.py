@@ -0,0 +1,147 @@
+"""Python API for registering figures without going through the CLI.
+
+    from slidedeck import Deck
+
+    deck = Deck()
+    with deck.batch():
+        for epoch in range(epochs):
+            ...
+            fig.savefig("figures/results/loss_" + str(epoch) + ".png")
+            deck.add("figures/results/loss_" + str(epoch) + ".png", caption="Epoch " + str(epoch))
+
+Adding a figure validates and names it exactly like 'slidedeck add', but
+the registry stays in memory between calls: it is only re-read when it
+changed on disk, and inside batch() it is read once and saved once.
+"""
+
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+from slidedeck import store
+from slidedeck.add import FigureError, copy_into_figures, expand_figure_paths, new_slide_entries, resolve_topic
+from slidedeck.registry import (
+    REGISTRY_PATH,
+    append_journal,
+    keep_resident,
+    load_registry,
+    load_slide_index,
+    load_yaml_cached,
+    save_registry,
+)
+
+
+class _PendingWrite:
+    """Registry state and new slides of one save: a single add() or a whole batch()."""
+
+    def __init__(self, journal: bool):
+        self.conn = None
+        if store.is_enabled():
+            self.conn = store.connect()
+            self.registry = store.load_meta(self.conn)
+            self.existing_ids = store.SlideIdLookup(self.conn)
+        elif journal:
+            # Appending needs only the topics and slide IDs, like 'slidedeck add --journal'
+            topics, self.existing_ids = load_slide_index()
+            self.registry = {"topics": topics}
+        else:
+            self.registry = load_registry()
+            self.existing_ids = {s["id"] for s in self.registry.get("slides") or []}
+        self.valid_topics = {t["id"] for t in self.registry["topics"]}
+        self.entries: list[dict] = []
+
+
+class Deck:
+    """The slide deck project in the current directory.
+
+    With journal=True new slides are appended to slides.journal instead of
+    rewriting slides.yaml, as with 'slidedeck add --journal'. Invalid figures
+    or topics raise FigureError with the same messages as the CLI.
+    """
+
+    def __init__(self, journal: bool = False):
+        self.journal = journal
+        self._batch: _PendingWrite | None = None
+        keep_resident()
+
+    def topic_ids(self) -> set[str]:
+        """IDs of the topics slides can be added to."""
+        if self._batch is not None:
+            return self._batch.valid_topics
+        if store.is_enabled():
+            with closing(store.connect()) as conn:
+                topics = store.load_meta(conn)["topics"]
+        else:
+            # Topics live in slides.yaml itself, also for a sharded registry
+            topics = load_yaml_cached(REGISTRY_PATH)["topics"]
+        return {t["id"] for t in topics}
+
+    @contextmanager
+    def batch(self) -> Iterator["Deck"]:
+        """Defer saving until the block ends, then write every slide added in it in one save.
+
+        Slides added before an exception in the block are still saved. Nested
+        batches join the outermost one.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = _PendingWrite(self.journal)
+        try:
+            yield self
+        finally:
+            pending, self._batch = self._batch, None
+            self._write(pending)
+
+    def add(
+        self,
+        figure_path: str | Path,
+        topic: str | None = None,
+        title: str | None = None,
+        caption: str = "",
+        notes: str = "",
+        tags: list[str] | None = None,
+        copy: bool = False,
+    ) -> dict:
+        """Register one figure and return its new slide entry.
+
+        Topic and title are inferred from the path unless given. With
+        copy=True the figure is copied into figures/<topic>/ first. A glob or
+        directory must match exactly one figure.
+        """
+        if self._batch is None:
+            # A batch of one, so that a failed add releases the registry like a failed batch
+            with self.batch():
+                return self.add(figure_path, topic, title, caption, notes, tags, copy)
+
+        sources = expand_figure_paths([str(figure_path)])
+        if len(sources) > 1:
+            raise FigureError(
+                "'" + str(figure_path) + "' matches " + str(len(sources)) + " figures; add them one at a time."
+            )
+        pending = self._batch
+        source = sources[0]
+        slide_topic = resolve_topic(source, topic, pending.valid_topics)
+        figure = str(copy_into_figures([source], [slide_topic])[0]) if copy else str(source)
+
+        entry = new_slide_entries(
+            [source], [slide_topic], [figure], pending.existing_ids, title, caption, notes, tags
+        )[0]
+        pending.entries.append(entry)
+        return entry
+
+    def _write(self, pending: _PendingWrite) -> None:
+        try:
+            if not pending.entries:
+                return
+            if pending.conn is not None:
+                with pending.conn:
+                    store.insert_slides(pending.conn, pending.entries)
+            elif self.journal:
+                append_journal(pending.entries)
+            else:
+                pending.registry.setdefault("slides", []).extend(pending.entries)
+                save_registry(pending.registry, topics={e["topic"] for e in pending.entries})
+        finally:
+            if pending.conn is not None:
+                pending.conn.close()
@@ -0,0 +1,418 @@
+"""Read git objects directly from .git without spawning git.
+
+Handles loose objects and version 2 pack indexes, including offset and ref
+deltas, which covers repositories written by stock git. Anything else
+(SHA-256 object format, alternates, objects missing from a partial clone,
+corrupt data) raises GitObjectError so callers can fall back to the git CLI.
+"""
+
+import mmap
+import os
+import re
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+_TYPE_NAMES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+_HEX_HASH = re.compile(r"[0-9a-f]{40}")
+# Tree entry modes of subdirectories and of submodule commits; other entries are blobs
+_TREE_MODE = b"40000"
+_GITLINK_MODE = b"160000"
+
+# Environment variables that point git at objects this reader would not see
+_GIT_ENV_OVERRIDES = ("GIT_DIR", "GIT_OBJECT_DIRECTORY", "GIT_ALTERNATE_OBJECT_DIRECTORIES", "GIT_COMMON_DIR")
+
+
+class GitObjectError(Exception):
+    """The object could not be read in-process; use the git CLI instead."""
+
+
+class ObjectNotFound(GitObjectError):
+    """The object is not in any loose file or pack this reader knows about."""
+
+
+class UnsupportedRepository(GitObjectError):
+    """The repository uses a layout this reader does not handle."""
+
+
+class _LRU(OrderedDict):
+    """Bounded cache that evicts the least recently stored entries.
+
+    Each entry has a weight (1 by default, or e.g. its size in bytes) and the
+    total weight is kept at or below capacity.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.capacity = capacity
+        self.weights: dict = {}
+        self.total = 0
+
+    def put(self, key, value, weight: int = 1) -> None:
+        if weight > self.capacity:
+            return
+        if key in self:
+            self.total -= self.weights[key]
+        self[key] = value
+        self.move_to_end(key)
+        self.weights[key] = weight
+        self.total += weight
+        while self.total > self.capacity:
+            oldest, _ = self.popitem(last=False)
+            self.total -= self.weights.pop(oldest)
+
+
+def find_repository(start: Path | None = None) -> tuple[Path, Path]:
+    """Locate (git_dir, worktree) for the repository containing start (default: cwd)."""
+    if any(name in os.environ for name in _GIT_ENV_OVERRIDES):
+        raise UnsupportedRepository("repository location is overridden by the environment")
+    path = (start or Path.cwd()).resolve()
+    for directory in (path, *path.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git, directory
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                return (directory / content[len("gitdir:"):].strip()).resolve(), directory
+    raise UnsupportedRepository("not inside a git work tree")
+
+
+def _read_varint(data, pos: int) -> tuple[int, int]:
+    """Little-endian base-128 size used in delta headers. Returns (value, next position)."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Reconstruct an object from its delta base and a git delta instruction stream."""
+    source_size, pos = _read_varint(delta, 0)
+    target_size, pos = _read_varint(delta, pos)
+    if source_size != len(base):
+        raise ValueError("delta base size mismatch")
+    base_view = memoryview(base)
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            # Copy from base: bits 0-3 select offset bytes, bits 4-6 size bytes
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base_view[offset:offset + (size or 0x10000)]
+        elif op:
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise ValueError("invalid delta opcode")
+    if len(out) != target_size:
+        raise ValueError("delta result size mismatch")
+    return bytes(out)
+
+
+def _inflate(data, offset: int, size: int) -> bytes:
+    """Decompress one zlib stream starting at offset whose output is size bytes."""
+    decompressor = zlib.decompressobj()
+    chunk = max(size + 256, 4096)
+    parts = []
+    while not decompressor.eof:
+        block = data[offset:offset + chunk]
+        if not block:
+            raise ValueError("truncated pack entry")
+        parts.append(decompressor.decompress(block))
+        offset += chunk
+    result = b"".join(parts)
+    if len(result) != size:
+        raise ValueError("pack entry size mismatch")
+    return result
+
+
+class _Pack:
+    """One packfile and its version 2 .idx."""
+
+    def __init__(self, idx_path: Path):
+        idx = idx_path.read_bytes()
+        if idx[:4] != b"\xfftOc" or struct.unpack(">I", idx[4:8])[0] != 2:
+            raise UnsupportedRepository("unsupported pack index " + idx_path.name)
+        self.idx = idx
+        self.fanout = struct.unpack(">256I", idx[8:8 + 1024])
+        count = self.fanout[255]
+        self.names_start = 8 + 1024
+        self.offsets_start = self.names_start + 24 * count  # names, then 4-byte CRCs
+        self.large_offsets_start = self.offsets_start + 4 * count
+        with open(idx_path.with_suffix(".pack"), "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def find(self, sha: bytes) -> int | None:
+        """Offset of the object in the pack, or None if the pack does not hold it."""
+        first = sha[0]
+        low = self.fanout[first - 1] if first else 0
+        high = self.fanout[first]
+        while low < high:
+            mid = (low + high) // 2
+            start = self.names_start + 20 * mid
+            name = self.idx[start:start + 20]
+            if name < sha:
+                low = mid + 1
+            elif name > sha:
+                high = mid
+            else:
+                return self._offset(mid)
+        return None
+
+    def _offset(self, position: int) -> int:
+        start = self.offsets_start + 4 * position
+        offset = struct.unpack(">I", self.idx[start:start + 4])[0]
+        if offset & 0x80000000:
+            start = self.large_offsets_start + 8 * (offset & 0x7FFFFFFF)
+            offset = struct.unpack(">Q", self.idx[start:start + 8])[0]
+        return offset
+
+    def close(self) -> None:
+        self.data.close()
+
+
+class ObjectStore:
+    """In-process reader for the objects, refs and trees of one repository.
+
+    Parsed trees and delta bases are kept in small caches, so reading many
+    revisions of the same figure resolves shared trees and delta chains once.
+    """
+
+    def __init__(self, git_dir: Path, worktree: Path):
+        self.git_dir = git_dir
+        self.worktree = worktree
+        commondir = git_dir / "commondir"
+        self.common_dir = (git_dir / commondir.read_text().strip()).resolve() if commondir.exists() else git_dir
+        self.objects_dir = self.common_dir / "objects"
+
+        try:
+            config = (self.common_dir / "config").read_text()
+        except OSError:
+            config = ""
+        if re.search(r"objectformat\s*=\s*sha256", config, re.IGNORECASE):
+            raise UnsupportedRepository("SHA-256 repositories are not supported")
+        if (self.objects_dir / "info" / "alternates").exists():
+            raise UnsupportedRepository("repositories with alternates are not supported")
+
+        # Packs are opened on the first object lookup that misses the loose objects
+        self.packs: dict[str, _Pack] = {}
+        self._trees = _LRU(512)
+        self._bases = _LRU(64 * 1024 * 1024)  # bytes
+        self._cwd = Path.cwd().resolve()
+        self._paths: dict[str, list[bytes] | None] = {}
+
+    @classmethod
+    def open(cls, start: Path | None = None) -> "ObjectStore":
+        """Open the repository containing start (default: the current directory)."""
+        return cls(*find_repository(start))
+
+    def __enter__(self) -> "ObjectStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for pack in self.packs.values():
+            pack.close()
+        self.packs.clear()
+
+    def _load_packs(self) -> bool:
+        """Open packs that appeared since the last call. Returns whether any were added."""
+        added = False
+        for idx_path in sorted((self.objects_dir / "pack").glob("*.idx")):
+            if idx_path.name in self.packs or not idx_path.with_suffix(".pack").exists():
+                continue
+            try:
+                self.packs[idx_path.name] = _Pack(idx_path)
+            except (OSError, ValueError, struct.error) as exc:
+                raise UnsupportedRepository("cannot open pack " + idx_path.name + ": " + str(exc)) from exc
+            added = True
+        return added
+
+    def read(self, sha: str) -> tuple[str, bytes]:
+        """Type and contents of the object with the given hex hash."""
+        try:
+            return self._read(sha)
+        except (zlib.error, struct.error, ValueError, IndexError, OSError) as exc:
+            raise GitObjectError("cannot read object " + sha + ": " + str(exc)) from exc
+
+    def _read(self, sha: str) -> tuple[str, bytes]:
+        # Packs first: after gc nearly everything is packed, and an index lookup is cheaper than a stat
+        binary = bytes.fromhex(sha)
+        for pack in self.packs.values():
+            offset = pack.find(binary)
+            if offset is not None:
+                return self._read_packed(pack, offset)
+
+        try:
+            with open(os.path.join(self.objects_dir, sha[:2], sha[2:]), "rb") as f:
+                raw = zlib.decompress(f.read())
+        except FileNotFoundError:
+            pass
+        else:
+            header, _, data = raw.partition(b"\0")
+            type_name, size = header.split(b" ")
+            if int(size) != len(data):
+                raise ValueError("loose object size mismatch")
+            return type_name.decode(), data
+
+        # Packs not opened yet, or a repack happened since they were listed
+        if self._load_packs():
+            return self._read(sha)
+        raise ObjectNotFound(sha)
+
+    def _entry_header(self, data, offset: int) -> tuple[int, int, int]:
+        """(type, inflated size, position of the entry body) of the pack entry at offset."""
+        byte = data[offset]
+        type_code = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        offset += 1
+        while byte & 0x80:
+            byte = data[offset]
+            offset += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        return type_code, size, offset
+
+    def _read_packed(self, pack: _Pack, offset: int) -> tuple[str, bytes]:
+        """Read a pack entry, following its delta chain down to a full object."""
+        data = pack.data
+        deltas = []
+        while True:
+            cached = self._bases.get((pack, offset))
+            if cached is not None:
+                type_name, result = cached
+                break
+            type_code, size, pos = self._entry_header(data, offset)
+            if type_code == _OFS_DELTA:
+                byte = data[pos]
+                pos += 1
+                distance = byte & 0x7F
+                while byte & 0x80:
+                    byte = data[pos]
+                    pos += 1
+                    distance = ((distance + 1) << 7) | (byte & 0x7F)
+                deltas.append((offset, _inflate(data, pos, size)))
+                offset -= distance
+            elif type_code == _REF_DELTA:
+                deltas.append((offset, _inflate(data, pos + 20, size)))
+                type_name, result = self._read(data[pos:pos + 20].hex())
+                break
+            elif type_code in _TYPE_NAMES:
+                type_name, result = _TYPE_NAMES[type_code], _inflate(data, pos, size)
+                self._bases.put((pack, offset), (type_name, result), len(result))
+                break
+            else:
+                raise ValueError("unknown pack entry type " + str(type_code))
+
+        for delta_offset, delta in reversed(deltas):
+            result = apply_delta(result, delta)
+            self._bases.put((pack, delta_offset), (type_name, result), len(result))
+        return type_name, result
+
+    def resolve_ref(self, name: str = "HEAD") -> str | None:
+        """Commit hash a ref points to, following symbolic refs; None if it does not exist yet."""
+        for _ in range(10):
+            ref_dir = self.git_dir if name == "HEAD" else self.common_dir
+            try:
+                content = (ref_dir / name).read_text().strip()
+            except OSError:
+                return self._packed_ref(name)
+            if not content.startswith("ref:"):
+                if not _HEX_HASH.fullmatch(content):
+                    raise UnsupportedRepository("unexpected ref contents in " + name)
+                return content
+            name = content[len("ref:"):].strip()
+        raise UnsupportedRepository("symbolic ref loop at " + name)
+
+    def _packed_ref(self, name: str) -> str | None:
+        try:
+            lines = (self.common_dir / "packed-refs").read_text().splitlines()
+        except OSError:
+            return None
+        for line in lines:
+            fields = line.split()
+            if len(fields) == 2 and fields[1] == name:
+                return fields[0]
+        return None
+
+    def _tree(self, sha: str) -> dict[bytes, tuple[bytes, str]]:
+        """Entries of a tree object, mapping name to (mode, hash)."""
+        entries = self._trees.get(sha)
+        if entries is not None:
+            return entries
+        type_name, data = self.read(sha)
+        if type_name != "tree":
+            raise GitObjectError(sha + " is not a tree")
+        entries = {}
+        pos = 0
+        while pos < len(data):
+            name_start = data.index(b" ", pos) + 1
+            name_end = data.index(b"\0", name_start)
+            entries[data[name_start:name_end]] = (data[pos:name_start - 1], data[name_end + 1:name_end + 21].hex())
+            pos = name_end + 21
+        self._trees.put(sha, entries)
+        return entries
+
+    def _repository_path(self, path: str) -> list[bytes] | None:
+        """Components of a path relative to the current directory, relative to the work tree root."""
+        if path not in self._paths:
+            relative = os.path.relpath(os.path.normpath(os.path.join(self._cwd, path)), self.worktree)
+            if relative == "." or relative.startswith(".."):
+                self._paths[path] = None
+            else:
+                self._paths[path] = [part.encode("utf-8") for part in Path(relative).parts]
+        return self._paths[path]
+
+    def blob_id(self, commit: str, path: str) -> str | None:
+        """Hash of the blob at path (relative to the current directory) in commit.
+
+        None if the path is absent, or is a directory or submodule there, as
+        'git cat-file --batch-check' reports for it.
+        """
+        parts = self._repository_path(path)
+        if parts is None:
+            return None
+        type_name, data = self.read(commit)
+        while type_name == "tag":
+            type_name, data = self.read(data.split(b"\n", 1)[0].split()[1].decode())
+        if type_name != "commit" or not data.startswith(b"tree "):
+            raise GitObjectError(commit + " is not a commit")
+        sha = data[5:45].decode()
+        mode = _TREE_MODE
+        for part in parts:
+            if mode != _TREE_MODE:
+                return None
+            entry = self._tree(sha).get(part)
+            if entry is None:
+                return None
+            mode, sha = entry
+        return None if mode in (_TREE_MODE, _GITLINK_MODE) else sha
+
+    def read_blob(self, commit: str, path: str) -> bytes | None:
+        """Contents of path (relative to the current directory) at commit, or None if it is not a blob there."""
+        sha = self.blob_id(commit, path)
+        if sha is None:
+            return None
+        type_name, data = self.read(sha)
+        return data if type_name == "blob" else None
@@ -1,46 +1,318 @@
 """Git history inspection for figures."""
 
 import base64
+import hashlib
+import json
+import os
 import subprocess
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
+from slidedeck import gitobjects, imagediff, store
+from slidedeck.registry import CACHE_DIR, ensure_cache_dir, load_registry, temporary_sibling, write_atomic
 
-def get_figure_history(figure_path: str) -> list[dict]:
-    """Get git commits that modified this figure.
+HISTORY_INDEX_PATH = CACHE_DIR / "history_index.json"
 
-    Returns a list of dicts with keys: commit, date, message
-    """
+# Bump when the layout of the persisted index changes.
+_HISTORY_INDEX_VERSION = 1
+
+
+def _git_head() -> str | None:
+    """Commit hash of HEAD, or None outside a git repository or before the first commit."""
+    try:
+        with gitobjects.ObjectStore.open() as objects:
+            head = objects.resolve_ref("HEAD")
+    except gitobjects.GitObjectError:
+        head = None
+    # None also when refs are stored in a way the reader does not know, e.g. reftable
+    if head is not None:
+        return head
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    return result.stdout.strip()
+
+
+def _normalize_path(figure_path: str) -> str:
+    """Path relative to the current directory, as git log --relative prints it."""
+    return os.path.normpath(os.path.relpath(figure_path))
+
+
+def _registry_figures() -> list[str]:
+    """Figure paths of every slide in the registry, or none if there is no registry."""
+    if store.is_enabled():
+        conn = store.connect()
+        try:
+            return store.figure_paths(conn)
+        finally:
+            conn.close()
+    try:
+        registry = load_registry()
+    except FileNotFoundError:
+        return []
+    return [s["figure"] for s in registry.get("slides") or [] if s.get("figure")]
+
+
+def _is_ancestor(commit: str, head: str) -> bool:
+    """Whether commit is reachable from head, i.e. head only added commits on top of it."""
     try:
         result = subprocess.run(
-            ["git", "log", "--format=%H|%ai|%s", "--follow", "--", figure_path],
+            ["git", "merge-base", "--is-ancestor", commit, head],
             capture_output=True,
+        )
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
+def _walk_history(
+    figure_paths: list[str],
+    revisions: str | None = None,
+) -> tuple[dict[str, list[dict]], dict[str, str]]:
+    """Walk git log once and collect the commits that touched each figure.
+
+    revisions limits the walk (e.g. "old..new"); by default all of HEAD's
+    history is walked. Returns the index and, for each figure, the name it had
+    at the oldest commit walked, which differs from its current path if it was
+    renamed in the walked range.
+    """
+    # Name at the commit being walked -> figures that had that name then
+    tracked = {path: [path] for path in figure_paths}
+    index: dict[str, list[dict]] = {path: [] for path in figure_paths}
+    command = [
+        "git", "-c", "core.quotePath=false", "log", "--relative", "-M", "--name-status",
+        "--format=%x01%H|%ai|%s",
+    ]
+    if revisions is not None:
+        command.append(revisions)
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            check=True,
         )
-    except subprocess.CalledProcessError:
-        return []
+    except FileNotFoundError:
+        return index, {path: path for path in figure_paths}
 
-    history = []
-    for line in result.stdout.strip().split("\n"):
-        if not line:
+    entry = None
+    for line in process.stdout:
+        line = line.rstrip("\n")
+        if line.startswith("\x01"):
+            parts = line[1:].split("|", 2)
+            entry = {"commit": parts[0], "date": parts[1], "message": parts[2]} if len(parts) == 3 else None
+            continue
+        if not line or entry is None:
             continue
-        parts = line.split("|", 2)
-        if len(parts) == 3:
-            history.append({
-                "commit": parts[0],
-                "date": parts[1],
-                "message": parts[2],
-            })
-    return history
 
+        fields = line.split("\t")
+        status = fields[0]
+        if status.startswith(("R", "C")) and len(fields) == 3:
+            old_name, new_name = fields[1], fields[2]
+            for figure in tracked.get(new_name, ()):
+                index[figure].append(dict(entry, path=new_name))
+            if status.startswith("R"):
+                # The rename also deletes old_name, as plain git log -- old_name reports
+                for figure in tracked.get(old_name, ()):
+                    index[figure].append(dict(entry, path=old_name))
+                if new_name in tracked:
+                    tracked.setdefault(old_name, []).extend(tracked.pop(new_name))
+        elif len(fields) == 2:
+            for figure in tracked.get(fields[1], ()):
+                index[figure].append(dict(entry, path=fields[1]))
+    process.wait()
+    return index, {figure: name for name, figures in tracked.items() for figure in figures}
+
+
+def build_history_index(figure_paths: list[str]) -> dict[str, list[dict]]:
+    """Collect the commits that touched each figure with a single git log walk.
+
+    Renames are followed like git log --follow: once a commit renames old -> new
+    for a tracked figure, older commits are matched against the old name. Each
+    entry records the figure's path at that commit under "path".
+    """
+    return _walk_history(figure_paths)[0]
+
+
+def update_history_index(figures: dict[str, list[dict]], cached_head: str, head: str) -> dict[str, list[dict]] | None:
+    """Extend an index computed at cached_head to head by walking only the new commits.
+
+    Returns None when the index cannot be extended (cached_head is not an
+    ancestor of head, e.g. after a rebase, or a figure was renamed from a path
+    the index does not cover), in which case it must be rebuilt.
+    """
+    if not _is_ancestor(cached_head, head):
+        return None
+    new_entries, old_names = _walk_history(list(figures), cached_head + ".." + head)
+    updated = {}
+    for figure, entries in new_entries.items():
+        older = figures.get(old_names[figure])
+        if older is None:
+            return None
+        updated[figure] = entries + older
+    return updated
+
+
+def load_history_index() -> dict | None:
+    """Load the persisted history index, or None if there is none."""
+    try:
+        with open(HISTORY_INDEX_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != _HISTORY_INDEX_VERSION:
+        return None
+    return data
+
+
+def save_history_index(data: dict) -> None:
+    """Persist the history index under the cache directory."""
+    try:
+        ensure_cache_dir()
+        write_atomic(HISTORY_INDEX_PATH, json.dumps(data).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def get_figure_histories(figure_paths: list[str]) -> dict[str, list[dict]]:
+    """History of several figures (see get_figure_history), keyed by the given paths.
+
+    All figures come from the same index, so at most one git log walk is
+    needed however many figures are requested.
+    """
+    head = _git_head()
+    if head is None:
+        return {figure_path: [] for figure_path in figure_paths}
+
+    keys = {figure_path: _normalize_path(figure_path) for figure_path in figure_paths}
+    data = load_history_index()
+    covered = data is not None and all(key in data["figures"] for key in keys.values())
+    if covered and data["head"] != head:
+        figures = update_history_index(data["figures"], data["head"], head)
+        if figures is not None:
+            data = {"version": _HISTORY_INDEX_VERSION, "head": head, "figures": figures}
+            save_history_index(data)
+    if not covered or data["head"] != head:
+        known = set(data["figures"]) if data is not None else set()
+        figures = sorted(known | {_normalize_path(f) for f in _registry_figures()} | set(keys.values()))
+        data = {"version": _HISTORY_INDEX_VERSION, "head": head, "figures": build_history_index(figures)}
+        save_history_index(data)
+    return {figure_path: data["figures"][key] for figure_path, key in keys.items()}
+
+
+def get_figure_history(figure_path: str) -> list[dict]:
+    """Get git commits that modified this figure.
+
+    Returns a list of dicts with keys: commit, date, message, path (the
+    figure's path at that commit, which differs from figure_path before a rename)
+
+    Results come from the persisted history index, which covers every figure
+    in the registry. When HEAD moves, only the new commits are walked and
+    merged in; the index is rebuilt with one full git log walk only when it
+    cannot be extended or a figure it does not cover is requested.
+    """
+    return get_figure_histories([figure_path])[figure_path]
+
+
+# Up to this many objects are read in-process. Beyond it one git process is faster
+# overall: its per-object cost is lower and its startup cost is paid once.
+IN_PROCESS_OBJECTS = 20
+
+
+def _open_object_store() -> gitobjects.ObjectStore | None:
+    """In-process object reader for the current repository, or None if it is not supported."""
+    try:
+        return gitobjects.ObjectStore.open()
+    except (gitobjects.GitObjectError, OSError):
+        return None
+
+
+class GitBlobReader:
+    """Read blobs at given commits without a git subprocess per version.
+
+    The first in_process_reads blobs are read in-process from .git (see
+    gitobjects). Later reads, and anything that reader cannot handle, go
+    through one long-lived 'git cat-file --batch' process started on first
+    use, so each read is a request/response round trip instead of a new
+    subprocess. Use as a context manager. Reads are serialized, so one reader
+    can be shared between threads.
+    """
 
-def extract_figure_version(figure_path: str, commit: str, output_path: Path) -> bool:
+    def __init__(self, in_process_reads: int = IN_PROCESS_OBJECTS):
+        self.in_process_reads = in_process_reads
+        self.objects = _open_object_store() if in_process_reads > 0 else None
+        self.process = None
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def read(self, commit: str, path: str) -> bytes | None:
+        """Contents of path (relative to the current directory) at commit, or None if it is not a blob there."""
+        with self.lock:
+            return self._read(commit, path)
+
+    def _read(self, commit: str, path: str) -> bytes | None:
+        if self.objects is not None and self.in_process_reads > 0:
+            self.in_process_reads -= 1
+            try:
+                return self.objects.read_blob(commit, path)
+            except gitobjects.GitObjectError:
+                pass
+        if self.process is None:
+            self.process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        self.process.stdin.write((commit + ":./" + path + "\n").encode("utf-8"))
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            # "<object> missing" or "<object> ambiguous"
+            return None
+        size = int(header[2])
+        data = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # trailing newline
+        return data if header[1] == b"blob" else None
+
+    def close(self) -> None:
+        if self.objects is not None:
+            self.objects.close()
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+def extract_figure_version(
+    figure_path: str,
+    commit: str,
+    output_path: Path,
+    reader: GitBlobReader | None = None,
+) -> bool:
     """Extract a specific version of a figure from git history.
 
+    Pass a GitBlobReader to reuse it across versions instead of spawning git for each one.
     Returns True if successful, False otherwise.
     """
+    if reader is not None:
+        data = reader.read(commit, figure_path)
+        if data is None:
+            return False
+        output_path.write_bytes(data)
+        return True
+
     try:
         result = subprocess.run(
             ["git", "show", commit + ":" + figure_path],
@@ -74,8 +346,236 @@ def show_history(figure_path: str) -> None:
     click.echo("\nUse 'slidedeck compare' to generate a visual comparison.")
 
 
-def generate_comparison(figure_path: str, output: str) -> None:
-    """Generate an HTML page showing all versions of a figure side by side."""
+def resolve_blobs(figure_path: str, history: list[dict]) -> list[str | None]:
+    """Blob hash of the figure at each history entry, or None where it does not exist.
+
+    Short histories are looked up in-process from the commit trees; longer ones,
+    or any the in-process reader cannot handle, are resolved by one
+    'git cat-file --batch-check' call.
+    """
+    return resolve_blob_specs([(e["commit"], e.get("path", figure_path)) for e in history])
+
+
+def resolve_blob_specs(specs: list[tuple[str, str]]) -> list[str | None]:
+    """Blob hash of each (commit, path) pair, or None where the path is not a blob (see resolve_blobs)."""
+    objects = _open_object_store() if len(specs) <= IN_PROCESS_OBJECTS else None
+    if objects is not None:
+        try:
+            return [objects.blob_id(commit, path) for commit, path in specs]
+        except gitobjects.GitObjectError:
+            pass
+        finally:
+            objects.close()
+
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            input="".join(commit + ":./" + path + "\n" for commit, path in specs),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return [None] * len(specs)
+
+    blobs = []
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        blobs.append(fields[0] if len(fields) == 3 and fields[1] == "blob" else None)
+    return blobs
+
+
+def group_by_blob(history: list[dict], blobs: list[str | None]) -> list[tuple[str, list[dict]]]:
+    """Group history entries that hold byte-identical figures.
+
+    Returns (blob, entries) pairs in order of each blob's newest appearance;
+    entries where the figure does not exist are dropped.
+    """
+    groups: dict[str, list[dict]] = {}
+    for entry, blob in zip(history, blobs):
+        if blob is not None:
+            groups.setdefault(blob, []).append(entry)
+    return list(groups.items())
+
+
+def _asset_name(blob: str, entries: list[dict], figure_path: str) -> str:
+    """File name of a version's image in the asset directory, named by its blob hash."""
+    return blob + (Path(entries[0].get("path", figure_path)).suffix or ".png")
+
+
+def _iter_version_data(
+    reader: GitBlobReader,
+    groups: list[tuple[str, list[dict]]],
+    figure_path: str,
+    asset_dir: Path | None = None,
+) -> Iterator[tuple[str, list[dict], bytes | None]]:
+    """(blob, entries, contents) of each version in groups, in order.
+
+    Each version is read once; versions that cannot be read are skipped. With
+    asset_dir, versions whose asset file a previous run wrote are not read
+    and have contents None (asset files are named by blob hash, so an
+    existing file always holds the same bytes).
+    """
+    for blob, entries in groups:
+        if asset_dir is not None and (asset_dir / _asset_name(blob, entries, figure_path)).exists():
+            yield blob, entries, None
+            continue
+        data = reader.read(entries[0]["commit"], entries[0].get("path", figure_path))
+        if data is not None:
+            yield blob, entries, data
+
+
+def _iter_version_diffs(
+    versions: Iterator[tuple[str, list[dict], bytes]],
+    jobs: int,
+) -> Iterator[tuple[tuple[str, list[dict], bytes], tuple[float, bytes] | None, str | None]]:
+    """(version, diff, blob of the older version) for each of versions, in order.
+
+    diff is the result of imagediff.diff_images against the previous (older)
+    version, None for the oldest one. The diffs read ahead of the caller;
+    versions they have read wait here, so each version is read only once.
+    """
+    read_ahead: deque = deque()
+
+    def contents() -> Iterator[bytes]:
+        for version in versions:
+            read_ahead.append(version)
+            yield version[2]
+
+    # One diff per consecutive pair, so both versions of the pair have been read
+    for result in imagediff.iter_version_diffs(contents(), jobs):
+        version = read_ahead.popleft()
+        yield version, result, read_ahead[0][0]
+    while read_ahead:
+        yield read_ahead.popleft(), None, None
+
+
+def cluster_similar_versions(
+    groups: list[tuple[str, list[dict]]],
+    figure_path: str,
+    reader: GitBlobReader,
+    hash_cache: dict[str, str | None] | None = None,
+) -> tuple[list[tuple[str, list[dict]]], dict[str, list[dict]]]:
+    """Collapse perceptually similar versions into the newest version of each cluster.
+
+    Versions are compared by perceptual hash (see imagediff), cached by blob
+    hash so only versions not seen before are decoded. Returns the remaining
+    groups and, per remaining blob, the history entries of the versions it hides.
+    """
+    # Only versions missing from the hash cache are read here; the page reads the versions it keeps
+    hashes = imagediff.blob_hashes(
+        [blob for blob, _ in groups],
+        lambda i: reader.read(groups[i][1][0]["commit"], groups[i][1][0].get("path", figure_path)),
+        hash_cache,
+    )
+    kept = []
+    hidden = {}
+    for members in imagediff.cluster_hashes(hashes):
+        blob, entries = groups[members[0]]
+        kept.append((blob, entries))
+        hidden[blob] = [entry for member in members[1:] for entry in groups[member][1]]
+    return kept, hidden
+
+
+def write_comparison_page(
+    figure_path: str,
+    groups: list[tuple[str, list[dict]]],
+    hidden: dict[str, list[dict]],
+    output_path: Path,
+    reader: GitBlobReader,
+    asset_dir: Path | None = None,
+    diff: bool = False,
+    jobs: int = 1,
+) -> int:
+    """Write the comparison page for the given versions (see generate_comparison).
+
+    groups are (blob, entries) pairs, newest first, and hidden the entries
+    folded into each blob by clustering. Images go to asset_dir if given,
+    otherwise they are embedded. Each version is read from git once, for
+    both its image and its diffs; versions that cannot be read are left out.
+    Returns the number of versions with no visible change from the previous
+    one (always 0 without diff).
+    """
+    tmp_path = temporary_sibling(output_path)
+    unchanged_count = 0
+    if diff:
+        # The diff needs every version's contents, even where the asset already exists
+        versions = _iter_version_diffs(_iter_version_data(reader, groups, figure_path), jobs)
+    else:
+        versions = ((v, None, None) for v in _iter_version_data(reader, groups, figure_path, asset_dir))
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(_comparison_html_head(figure_path, len(groups)))
+            for i, ((blob, entries, data), result, older_blob) in enumerate(versions):
+                entry = entries[0]
+                version = {
+                    "index": i + 1,
+                    "commit": entry["commit"][:8],
+                    "date": entry["date"],
+                    "message": entry["message"],
+                }
+                if len(entries) > 1:
+                    version["duplicates"] = [(e["commit"][:8], e["date"]) for e in entries[1:]]
+                if hidden.get(blob):
+                    version["similar"] = [(e["commit"][:8], e["date"]) for e in hidden[blob]]
+                if asset_dir is not None:
+                    name = _asset_name(blob, entries, figure_path)
+                    if not (asset_dir / name).exists():
+                        write_atomic(asset_dir / name, data)
+                    version["src"] = asset_dir.name + "/" + name
+                else:
+                    # Base64 encode for embedding in HTML
+                    version["data"] = base64.b64encode(data).decode()
+                if result is not None:
+                    version["diff_percent"], heatmap = result
+                    if version["diff_percent"] < imagediff.UNCHANGED_PERCENT:
+                        unchanged_count += 1
+                    elif asset_dir is not None:
+                        name = blob + "-" + older_blob + ".diff.png"
+                        if not (asset_dir / name).exists():
+                            write_atomic(asset_dir / name, heatmap)
+                        version["diff_src"] = asset_dir.name + "/" + name
+                    else:
+                        version["diff_src"] = "data:image/png;base64," + base64.b64encode(heatmap).decode()
+                f.write(_version_card(version))
+            f.write(_COMPARISON_HTML_TAIL)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return unchanged_count
+
+
+def generate_comparison(
+    figure_path: str,
+    output: str,
+    external_assets: bool = False,
+    diff: bool = False,
+    jobs: int = 1,
+    cluster: bool = False,
+) -> None:
+    """Generate an HTML page showing all versions of a figure side by side.
+
+    Versions are streamed from git into the page one at a time, without temporary
+    files, so memory stays bounded by the largest single version. Commits that
+    produced byte-identical files (reverts, re-saves) share one card and the
+    image is extracted only once.
+
+    With external_assets=True each version is written once, named by its blob
+    hash, to a <output>_files/ directory next to the page and referenced with
+    lazily loaded <img> tags instead of being embedded as base64.
+
+    With diff=True each version also shows a heatmap of the pixels that changed
+    from the previous version and the percentage changed (see imagediff),
+    computed in jobs processes.
+
+    With cluster=True perceptually similar versions (e.g. regenerated by CI
+    with different encoder bytes) are shown as one card listing the hidden
+    commits.
+    """
+    if diff:
+        imagediff.require_imaging("--diff")
+    if cluster:
+        imagediff.require_imaging("--cluster")
     history = get_figure_history(figure_path)
 
     if not history:
@@ -86,44 +586,224 @@ def generate_comparison(figure_path: str, output: str) -> None:
         click.echo("Only one version found. Nothing to compare.")
         return
 
-    # Create temporary directory for extracted versions
-    temp_dir = Path(".figure_history_temp")
-    temp_dir.mkdir(exist_ok=True)
+    # Entries where the figure does not exist (e.g. the commit that deleted it) are dropped
+    groups = group_by_blob(history, resolve_blobs(figure_path, history))
+    duplicate_count = sum(len(entries) - 1 for _, entries in groups)
+    if len(groups) < 2:
+        click.echo("All versions are identical. Nothing to compare.")
+        return
 
-    # Extract each version
-    versions = []
-    for i, entry in enumerate(history):
-        version_path = temp_dir / ("v" + str(i + 1) + "_" + entry["commit"][:8] + ".png")
-        if extract_figure_version(figure_path, entry["commit"], version_path):
-            # Read and base64 encode for embedding in HTML
-            with open(version_path, "rb") as f:
-                img_data = base64.b64encode(f.read()).decode()
-            versions.append({
-                "index": i + 1,
-                "commit": entry["commit"][:8],
-                "date": entry["date"],
-                "message": entry["message"],
-                "data": img_data,
-            })
-
-    # Generate HTML
-    html = generate_comparison_html(figure_path, versions)
-    Path(output).write_text(html)
-
-    # Cleanup temp directory
-    for f in temp_dir.iterdir():
-        f.unlink()
-    temp_dir.rmdir()
+    output_path = Path(output)
+    asset_dir = output_path.with_name(output_path.stem + "_files")
+    if external_assets:
+        asset_dir.mkdir(exist_ok=True)
+    with GitBlobReader() as reader:
+        hidden: dict[str, list[dict]] = {}
+        if cluster:
+            groups, hidden = cluster_similar_versions(groups, figure_path, reader)
+        unchanged_count = write_comparison_page(
+            figure_path, groups, hidden, output_path, reader,
+            asset_dir=asset_dir if external_assets else None, diff=diff, jobs=jobs,
+        )
 
     click.echo("Generated comparison: " + output)
-    click.echo("Showing " + str(len(versions)) + " versions")
+    if external_assets:
+        click.echo("Images written to: " + str(asset_dir))
+    if duplicate_count:
+        click.echo(
+            "Showing " + str(len(groups)) + " versions (" + str(duplicate_count) + " identical revisions collapsed)"
+        )
+    else:
+        click.echo("Showing " + str(len(groups)) + " versions")
+    hidden_count = sum(len(entries) for entries in hidden.values())
+    if hidden_count:
+        click.echo(str(hidden_count) + " perceptually similar revision(s) hidden")
+    if unchanged_count:
+        click.echo(str(unchanged_count) + " version(s) have no visible change from the previous one")
 
 
-def generate_comparison_html(figure_path: str, versions: list[dict]) -> str:
-    """Generate HTML content for the comparison page."""
-    version_cards = []
-    for v in versions:
-        card = """
+def _page_name(figure_path: str) -> str:
+    """File name of a figure's page in a deck-wide comparison.
+
+    Readable but ambiguous on its own (a/b__c.png and a__b/c.png), so a short
+    hash of the path keeps names of different figures apart.
+    """
+    path = _normalize_path(figure_path)
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:8]
+    return path.replace(os.sep, "__") + "-" + digest + ".html"
+
+
+def generate_all_comparisons(
+    output_dir: Path,
+    external_assets: bool = False,
+    diff: bool = False,
+    jobs: int = 1,
+    cluster: bool = False,
+) -> None:
+    """Generate a comparison page for every figure in the registry, plus an index.html.
+
+    All figures share one history index lookup (at most one git log walk), one
+    blob-hash resolution and one GitBlobReader. Pages are written by a pool of
+    jobs threads; diffs are computed in the thread writing the page. Figures
+    with fewer than two distinct versions get no page, only an index entry.
+    With external_assets=True all pages share one assets/ directory, so an
+    image used by several figures is stored once.
+    """
+    if diff:
+        imagediff.require_imaging("--diff")
+    if cluster:
+        imagediff.require_imaging("--cluster")
+    figures = list(dict.fromkeys(_registry_figures()))
+    if not figures:
+        click.echo("No figures in the registry.")
+        return
+
+    histories = get_figure_histories(figures)
+    specs = [(e["commit"], e.get("path", figure)) for figure in figures for e in histories[figure]]
+    blobs = iter(resolve_blob_specs(specs))
+    figure_groups = {
+        figure: group_by_blob(histories[figure], [next(blobs) for _ in histories[figure]]) for figure in figures
+    }
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    asset_dir = output_dir / "assets" if external_assets else None
+    if asset_dir is not None:
+        asset_dir.mkdir(exist_ok=True)
+    hash_cache = imagediff.load_hash_cache() if cluster else None
+
+    def write_page(figure: str) -> dict:
+        groups = figure_groups[figure]
+        summary = {"figure": figure, "commits": len(histories[figure]), "versions": len(groups), "page": None}
+        if len(groups) < 2:
+            return summary
+        hidden: dict[str, list[dict]] = {}
+        if cluster:
+            groups, hidden = cluster_similar_versions(groups, figure, reader, hash_cache)
+        page = _page_name(figure)
+        summary["unchanged"] = write_comparison_page(figure, groups, hidden, output_dir / page, reader, asset_dir, diff)
+        summary.update(page=page, versions=len(groups), hidden=sum(len(entries) for entries in hidden.values()))
+        return summary
+
+    with GitBlobReader() as reader, ThreadPoolExecutor(max_workers=jobs) as pool:
+        summaries = list(pool.map(write_page, figures))
+    if cluster:
+        imagediff.save_hash_cache(hash_cache)
+
+    index_path = output_dir / "index.html"
+    write_atomic(index_path, _comparison_index_html(summaries).encode("utf-8"))
+    page_count = sum(1 for summary in summaries if summary["page"])
+    click.echo("Generated " + str(page_count) + " comparison page(s) in " + str(output_dir))
+    click.echo("Index: " + str(index_path))
+    if page_count < len(summaries):
+        click.echo(str(len(summaries) - page_count) + " figure(s) have fewer than two versions and no page")
+
+
+def _comparison_index_html(summaries: list[dict]) -> str:
+    """Index page linking the comparison page of each figure."""
+    rows = []
+    for summary in summaries:
+        if summary["page"]:
+            name = '<a href="' + summary["page"] + '">' + summary["figure"] + "</a>"
+        else:
+            name = summary["figure"]
+        notes = []
+        if summary.get("hidden"):
+            notes.append(str(summary["hidden"]) + " perceptually similar hidden")
+        if summary.get("unchanged"):
+            notes.append(str(summary["unchanged"]) + " with no visible change")
+        if not summary["page"]:
+            notes.append("nothing to compare" if summary["commits"] else "no git history")
+        rows.append(
+            "            <tr><td>" + name + "</td><td>" + str(summary["versions"]) + "</td><td>"
+            + str(summary["commits"]) + "</td><td>" + ", ".join(notes) + "</td></tr>"
+        )
+    html_parts = [
+        """<!DOCTYPE html>
+<html>
+<head>
+    <title>Figure History</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }
+        h1 {
+            color: #333;
+            border-bottom: 2px solid #007acc;
+            padding-bottom: 10px;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            background: white;
+        }
+        th, td {
+            text-align: left;
+            padding: 6px 12px;
+            border-bottom: 1px solid #ddd;
+        }
+        a {
+            color: #007acc;
+        }
+    </style>
+</head>
+<body>
+    <h1>Figure History</h1>
+    <p>""",
+        str(len(summaries)),
+        """ figures</p>
+    <table>
+        <thead>
+            <tr><th>Figure</th><th>Versions</th><th>Commits</th><th>Notes</th></tr>
+        </thead>
+        <tbody>
+""",
+        "\n".join(rows),
+        """
+        </tbody>
+    </table>
+</body>
+</html>
+""",
+    ]
+    return "".join(html_parts)
+
+
+def _commit_list(commits: list[tuple[str, str]]) -> str:
+    """HTML for a list of (commit, date) pairs."""
+    return ", ".join('<span class="commit">' + commit + "</span> " + date for commit, date in commits)
+
+
+def _version_card(v: dict) -> str:
+    """HTML card for one figure version.
+
+    The image is embedded from v["data"] (base64) or, if v has a "src", loaded
+    lazily from that URL. v["duplicates"] optionally lists (commit, date) pairs
+    of other commits with the same image, v["similar"] those of hidden versions
+    that look the same, and v["diff_percent"] / v["diff_src"]
+    the change from the previous version and its heatmap URL.
+    """
+    if "src" in v:
+        img = '<img src="' + v["src"] + '" loading="lazy" alt="Version ' + str(v["index"]) + '">'
+    else:
+        img = '<img src="data:image/png;base64,' + v["data"] + '" alt="Version ' + str(v["index"]) + '">'
+    if v.get("duplicates"):
+        img = '<p class="duplicates">Identical in: ' + _commit_list(v["duplicates"]) + "</p>\n            " + img
+    if v.get("similar"):
+        hidden = str(len(v["similar"])) + " perceptually similar version(s) hidden: " + _commit_list(v["similar"])
+        img = '<p class="similar">' + hidden + "</p>\n            " + img
+    if "diff_percent" in v:
+        if v["diff_percent"] < imagediff.UNCHANGED_PERCENT:
+            img += '\n            <p class="diff unchanged">No visible change from the previous version</p>'
+        else:
+            percent = str(round(v["diff_percent"], 2))
+            img += '\n            <p class="diff">' + percent + "% of pixels changed from the previous version</p>"
+            alt = "Changes in version " + str(v["index"])
+            img += '\n            <img class="heatmap" src="' + v["diff_src"] + '" loading="lazy" alt="' + alt + '">'
+    return """
         <div class="version-card">
             <h3>Version """ + str(v["index"]) + """</h3>
             <p class="meta">
@@ -131,11 +811,13 @@ def generate_comparison_html(figure_path: str, versions: list[dict]) -> str:
                 <span class="date">""" + v["date"] + """</span>
             </p>
             <p class="message">""" + v["message"] + """</p>
-            <img src="data:image/png;base64,""" + v["data"] + """" alt="Version """ + str(v["index"]) + """">
+            """ + img + """
         </div>
         """
-        version_cards.append(card)
 
+
+def _comparison_html_head(figure_path: str, version_count: int) -> str:
+    """Opening HTML of the comparison page, up to the first version card."""
     # Build HTML using string concatenation to avoid Jinja2 conflicts with braces
     html_parts = [
         """<!DOCTYPE html>
@@ -189,6 +871,17 @@ def generate_comparison_html(figure_path: str, versions: list[dict]) -> str:
             font-style: italic;
             color: #555;
         }
+        .duplicates, .similar {
+            font-size: 0.85em;
+            color: #666;
+        }
+        .diff {
+            font-size: 0.9em;
+            color: #c00;
+        }
+        .diff.unchanged {
+            color: #080;
+        }
         .version-card img {
             max-width: 100%;
             border: 1px solid #ddd;
@@ -201,15 +894,22 @@ def generate_comparison_html(figure_path: str, versions: list[dict]) -> str:
         figure_path,
         """</h1>
     <p>""",
-        str(len(versions)),
+        str(version_count),
         """ versions found (newest first)</p>
     <div class="versions">
         """,
-        "".join(version_cards),
-        """
+    ]
+    return "".join(html_parts)
+
+
+_COMPARISON_HTML_TAIL = """
     </div>
 </body>
 </html>
-""",
-    ]
-    return "".join(html_parts)
+"""
+
+
+def generate_comparison_html(figure_path: str, versions: list[dict]) -> str:
+    """Generate HTML content for the comparison page."""
+    version_cards = [_version_card(v) for v in versions]
+    return _comparison_html_head(figure_path, len(versions)) + "".join(version_cards) + _COMPARISON_HTML_TAIL
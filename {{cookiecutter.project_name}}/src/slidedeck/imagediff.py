@@ -0,0 +1,248 @@
+"""Pixel-level differences and perceptual hashes of figure versions.
+
+Needs the optional numpy and Pillow dependencies (pip install 'slidedeck[diff]');
+they are imported only when a diff or hash is requested.
+"""
+
+import io
+import json
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+
+from slidedeck.registry import CACHE_DIR, ensure_cache_dir, write_atomic
+
+PHASH_CACHE_PATH = CACHE_DIR / "phash.json"
+
+# Pairs with fewer changed pixels than this (in percent) count as unchanged
+UNCHANGED_PERCENT = 0.01
+
+# Perceptual hashes are HASH_SIZE * HASH_SIZE gradient bits plus the mean colour;
+# versions whose gradient bits differ in at most SIMILAR_BITS bits and whose
+# mean colours differ by at most SIMILAR_COLOR per channel are perceptually similar
+HASH_SIZE = 16
+SIMILAR_BITS = 3
+SIMILAR_COLOR = 8
+
+# Bump when the layout of perceptual hashes changes, so cached hashes are recomputed
+_HASH_VERSION = 2
+
+# Low bits of a perceptual hash holding the mean colour, 8 bits per RGB channel
+_COLOR_BITS = 24
+
+# Faded background of the heatmap: the newer version in grey at this opacity
+_BACKGROUND_OPACITY = 0.3
+
+
+def require_imaging(feature: str) -> None:
+    """Exit with a clear message if numpy or Pillow is missing."""
+    try:
+        import numpy  # noqa: F401
+        import PIL  # noqa: F401
+    except ImportError:
+        click.echo("Error: " + feature + " needs numpy and Pillow.", err=True)
+        click.echo("Install them with: pip install 'slidedeck[diff]'", err=True)
+        raise SystemExit(1)
+
+
+def _decode(data: bytes):
+    """Decode an image into an RGBA uint8 array of shape (height, width, 4)."""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGBA"))
+
+
+def _pad(array, height: int, width: int):
+    """Pad an image array with transparent pixels to the given size."""
+    import numpy as np
+
+    padded = np.zeros((height, width, 4), dtype=array.dtype)
+    padded[:array.shape[0], :array.shape[1]] = array
+    return padded
+
+
+def diff_images(newer: bytes, older: bytes) -> tuple[float, bytes] | None:
+    """Compare two encoded images pixel by pixel.
+
+    Returns the percentage of pixels that changed and a PNG heatmap: the newer
+    version faded to grey with changed pixels in red, stronger where the change
+    is larger. Images of different sizes are compared on the larger canvas.
+    Returns None if either version cannot be decoded (e.g. SVG or PDF figures).
+    """
+    import numpy as np
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        new, old = _decode(newer), _decode(older)
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+
+    height = max(new.shape[0], old.shape[0])
+    width = max(new.shape[1], old.shape[1])
+    if new.shape != old.shape:
+        new, old = _pad(new, height, width), _pad(old, height, width)
+
+    # Largest per-channel difference, 0-255
+    magnitude = np.abs(new.astype(np.int16) - old.astype(np.int16)).max(axis=2)
+    changed = magnitude > 0
+    percent = float(changed.mean() * 100)
+
+    grey = new[:, :, :3].mean(axis=2) * _BACKGROUND_OPACITY + 255 * (1 - _BACKGROUND_OPACITY)
+    # Even the smallest change stays visible: red opacity ranges from 0.5 to 1
+    alpha = np.where(changed, 0.5 + magnitude / 510, 0.0)
+    heatmap = np.empty((height, width, 3), dtype=np.uint8)
+    heatmap[:, :, 0] = grey * (1 - alpha) + 255 * alpha
+    heatmap[:, :, 1] = grey * (1 - alpha)
+    heatmap[:, :, 2] = grey * (1 - alpha)
+
+    buffer = io.BytesIO()
+    Image.fromarray(heatmap).save(buffer, format="PNG", optimize=True)
+    return percent, buffer.getvalue()
+
+
+def _consecutive_pairs(versions: Iterable[bytes]) -> Iterator[tuple[bytes, bytes]]:
+    """(newer, older) pairs of consecutive versions."""
+    newer = None
+    for index, older in enumerate(versions):
+        if index:
+            yield newer, older
+        newer = older
+
+
+def _diff_pair(pair: tuple[bytes, bytes]) -> tuple[float, bytes] | None:
+    return diff_images(*pair)
+
+
+def iter_version_diffs(versions: Iterable[bytes], jobs: int = 1) -> Iterator[tuple[float, bytes] | None]:
+    """Diff each version against the next one in versions (newest first), in order.
+
+    Yields one result of diff_images per consecutive pair. With jobs > 1 the
+    pairs are diffed in a process pool; at most 2 * jobs pairs are in flight,
+    so only a bounded number of versions is held in memory.
+    """
+    pairs = _consecutive_pairs(versions)
+    if jobs <= 1:
+        for pair in pairs:
+            yield _diff_pair(pair)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for pair in pairs:
+            pending.append(pool.submit(_diff_pair, pair))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def perceptual_hash(data: bytes, hash_size: int = HASH_SIZE) -> int | None:
+    """Difference hash (dHash) of an encoded image plus its mean colour, or None if it cannot be decoded.
+
+    The image is flattened onto white, shrunk to (hash_size + 1) x hash_size grey
+    pixels, and each bit records whether a pixel is brighter than its right
+    neighbour. Re-encoding or rendering noise leaves the hash (nearly) unchanged.
+    Gradients alone do not see colour or brightness (a solid green and a solid
+    black figure hash the same), so the mean RGB colour is kept in the low
+    _COLOR_BITS bits.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            rgba = image.convert("RGBA")
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+    flat = Image.alpha_composite(Image.new("RGBA", rgba.size, "white"), rgba)
+    pixels = flat.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS).tobytes()
+
+    bits = 0
+    for row in range(hash_size):
+        start = row * (hash_size + 1)
+        for col in range(start, start + hash_size):
+            bits = (bits << 1) | (pixels[col] > pixels[col + 1])
+    red, green, blue = flat.convert("RGB").resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+    return (bits << _COLOR_BITS) | (red << 16) | (green << 8) | blue
+
+
+def _similar(a: int, b: int, max_distance: int) -> bool:
+    """Whether two perceptual hashes are within max_distance gradient bits and SIMILAR_COLOR per channel."""
+    if ((a ^ b) >> _COLOR_BITS).bit_count() > max_distance:
+        return False
+    return all(abs((a >> shift & 0xFF) - (b >> shift & 0xFF)) <= SIMILAR_COLOR for shift in (16, 8, 0))
+
+
+def cluster_hashes(hashes: list[int | None], max_distance: int = SIMILAR_BITS) -> list[list[int]]:
+    """Group the indices of similar hashes.
+
+    Each index joins the first cluster whose first member is within
+    max_distance differing bits, so clusters keep the order of their first
+    member. Missing hashes (undecodable images) always stand alone.
+    """
+    clusters: list[list[int]] = []
+    for i, value in enumerate(hashes):
+        for cluster in clusters:
+            first = hashes[cluster[0]]
+            if value is not None and first is not None and _similar(value, first, max_distance):
+                cluster.append(i)
+                break
+        else:
+            clusters.append([i])
+    return clusters
+
+
+def load_hash_cache() -> dict[str, str | None]:
+    """Perceptual hashes computed by earlier runs, keyed by blob hash (hex strings, None if undecodable)."""
+    try:
+        with open(PHASH_CACHE_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("hash_size") != HASH_SIZE or data.get("version") != _HASH_VERSION:
+        return {}
+    return data["hashes"]
+
+
+def save_hash_cache(hashes: dict[str, str | None]) -> None:
+    """Persist perceptual hashes under the cache directory."""
+    try:
+        ensure_cache_dir()
+        data = {"hash_size": HASH_SIZE, "version": _HASH_VERSION, "hashes": hashes}
+        write_atomic(PHASH_CACHE_PATH, json.dumps(data).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def blob_hashes(
+    blobs: list[str],
+    read: Callable[[int], bytes | None],
+    cache: dict[str, str | None] | None = None,
+) -> list[int | None]:
+    """Perceptual hash of each blob, decoding only blobs missing from the cache.
+
+    read(i) returns the contents of blobs[i]. Git blob hashes identify content,
+    so cached hashes never go stale. Pass a cache from load_hash_cache to share
+    it between calls; it is then updated in place and the caller saves it.
+    """
+    shared = cache is not None
+    if cache is None:
+        cache = load_hash_cache()
+    changed = False
+    hashes = []
+    for i, blob in enumerate(blobs):
+        if blob not in cache:
+            data = read(i)
+            if data is None:
+                hashes.append(None)
+                continue
+            value = perceptual_hash(data)
+            cache[blob] = None if value is None else format(value, "x")
+            changed = True
+        hashes.append(None if cache[blob] is None else int(cache[blob], 16))
+    if changed and not shared:
+        save_hash_cache(cache)
+    return hashes
@@ -0,0 +1,175 @@
+"""Streaming ingest of slide records: slidedeck add --stdin.
+
+Each input line is a JSON object describing one figure:
+
+    {"path": "figures/results/loss.png", "topic": "results", "title": "Loss",
+     "caption": "...", "notes": "...", "tags": ["training"]}
+
+Only path is required; the rest are inferred or defaulted like 'slidedeck
+add' does. Records are validated against the registry topics as they
+arrive and committed in batches of at most BATCH_SIZE records, at the
+latest BATCH_SECONDS after the oldest pending record arrived. Commits
+append to slides.journal (or insert into slides.db), so they cost the same
+however large the deck is.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+import click
+
+from slidedeck import store
+from slidedeck.add import infer_topic_from_path, new_slide_entries
+from slidedeck.registry import append_journal, load_slide_index
+
+BATCH_SIZE = 1000
+BATCH_SECONDS = 1.0
+
+# Lines read ahead of validation; bounds memory if input arrives faster than it is committed
+_READ_AHEAD = 10000
+
+
+class RecordError(ValueError):
+    """A record that cannot be added; the message says why."""
+
+
+def _read_lines(stream: Iterable[str], lines: queue.Queue) -> None:
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def _record_entry(
+    line: str,
+    valid_topics: set[str],
+    existing_ids,
+    defaults: dict,
+) -> dict:
+    """Slide entry for one NDJSON record, or RecordError if it is invalid."""
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise RecordError("Invalid JSON: " + str(e))
+    if not isinstance(record, dict):
+        raise RecordError("Expected a JSON object.")
+    path = record.get("path")
+    if not isinstance(path, str) or not path:
+        raise RecordError("Missing 'path'.")
+    source = Path(path)
+    if not source.is_file():
+        raise RecordError("Path '" + path + "' does not exist.")
+
+    for key in ("topic", "title", "caption", "notes"):
+        if record.get(key) is not None and not isinstance(record[key], str):
+            raise RecordError("'" + key + "' must be a string.")
+    # null means the same as leaving the field out
+    record = {key: value for key, value in record.items() if value is not None}
+
+    topic = record.get("topic") or defaults["topic"] or infer_topic_from_path(source)
+    if topic is None:
+        raise RecordError("Could not infer topic from path '" + path + "'. Please give 'topic'.")
+    if topic not in valid_topics:
+        raise RecordError("Unknown topic '" + str(topic) + "'.")
+
+    tags = record.get("tags", defaults["tags"])
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        raise RecordError("'tags' must be a list of strings.")
+
+    entries = new_slide_entries(
+        [source],
+        [topic],
+        [path],
+        existing_ids,
+        title=record.get("title"),
+        caption=record.get("caption", defaults["caption"]),
+        notes=record.get("notes", defaults["notes"]),
+        tags=tags,
+    )
+    return entries[0]
+
+
+def ingest_records(
+    stream: Iterable[str],
+    topic: str | None = None,
+    caption: str = "",
+    notes: str = "",
+    tags: list[str] | None = None,
+    batch_size: int = BATCH_SIZE,
+    batch_seconds: float = BATCH_SECONDS,
+) -> tuple[int, int]:
+    """Add slides from NDJSON records in stream until it ends.
+
+    topic, caption, notes and tags are defaults for records that omit them.
+    Invalid records are reported on stderr and skipped. A batch is committed
+    once it holds batch_size records or its first record is batch_seconds
+    old; whatever is pending is committed when input ends or on Ctrl-C.
+    Returns the number of slides added and of records rejected.
+    """
+    conn = None
+    if store.is_enabled():
+        conn = store.connect()
+        registry = store.load_meta(conn)
+        existing_ids = store.SlideIdLookup(conn)
+    else:
+        registry_topics, existing_ids = load_slide_index()
+        registry = {"topics": registry_topics}
+    valid_topics = {t["id"] for t in registry["topics"]}
+    defaults = {"topic": topic, "caption": caption, "notes": notes, "tags": tags or []}
+
+    # A reader thread lets a partial batch be committed while input is idle
+    lines: queue.Queue = queue.Queue(maxsize=_READ_AHEAD)
+    threading.Thread(target=_read_lines, args=(stream, lines), daemon=True).start()
+
+    batch: list[dict] = []
+    added = rejected = 0
+
+    def commit() -> None:
+        nonlocal added
+        if conn is not None:
+            with conn:
+                store.insert_slides(conn, batch)
+        else:
+            # Renumbers IDs another writer took since this batch was validated
+            append_journal(batch)
+            existing_ids.update(e["id"] for e in batch)
+        added += len(batch)
+        click.echo("Committed " + str(len(batch)) + " slide(s), " + str(added) + " in total")
+        batch.clear()
+
+    line_number = 0
+    deadline = 0.0
+    try:
+        while True:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()) if batch else None)
+            except queue.Empty:
+                commit()
+                continue
+            if line is None:
+                break
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                entry = _record_entry(line, valid_topics, existing_ids, defaults)
+            except RecordError as e:
+                click.echo("Error: line " + str(line_number) + ": " + str(e), err=True)
+                rejected += 1
+                continue
+            if not batch:
+                deadline = time.monotonic() + batch_seconds
+            batch.append(entry)
+            if len(batch) >= batch_size or time.monotonic() >= deadline:
+                commit()
+    finally:
+        if batch:
+            commit()
+        if conn is not None:
+            conn.close()
+    return added, rejected
@@ -0,0 +1,626 @@
+"""Load and save the slides registry, with a compiled cache of parsed YAML."""
+
+import datetime
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows: journal writers are not serialized
+    fcntl = None
+
+REGISTRY_PATH = Path("slides.yaml")
+CACHE_DIR = Path(".slidedeck")
+
+# Bump when the layout of the cached snapshot changes.
+_CACHE_VERSION = 3
+
+# Bump when the layout of the cached slide ID index changes.
+_ID_INDEX_VERSION = 2
+
+# Dates and times in parsed YAML are stored in cache files as (tag, isoformat) tuples
+_DATE_TAG = "\0slidedeck:date"
+_DATETIME_TAG = "\0slidedeck:datetime"
+
+# Slides parsed from YAML vs reused from the cache since the last reset_parse_stats().
+parse_stats = {"parsed": 0, "reused": 0}
+
+# mkstemp creates files only the owner can read; atomic writes restore the usual permissions
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+# Parsed YAML files kept in memory by long-running processes, keyed by resolved
+# path: (size, mtime_ns, data). None unless keep_resident() was called.
+_resident: dict[str, tuple[int, int, dict]] | None = None
+
+# Last slide ID index read or written per registry, keyed like the cache files.
+_id_indexes: dict[str, tuple] = {}
+
+
+def _path_key(path: Path) -> str:
+    return hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:16]
+
+
+def _cache_path(path: Path) -> Path:
+    """Location of the compiled snapshot for a YAML file."""
+    return CACHE_DIR / ("registry_" + _path_key(path) + ".marshal")
+
+
+def ensure_cache_dir() -> None:
+    """Create the cache directory and keep it out of git."""
+    CACHE_DIR.mkdir(exist_ok=True)
+    gitignore = CACHE_DIR / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("*\n")
+
+
+def temporary_sibling(path: Path) -> Path:
+    """Create an empty temporary file with a unique name next to path, to be os.replace'd over it.
+
+    Unique names keep concurrent writers of the same file from writing into
+    each other's temporary file.
+    """
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix="." + path.name + ".", suffix=".tmp")
+    os.close(fd)
+    os.chmod(name, 0o666 & ~_UMASK)
+    return Path(name)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace path with data so that readers never see a partially written file."""
+    tmp_path = temporary_sibling(path)
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _tag_dates(value):
+    """Copy of parsed YAML with dates and times replaced by tagged tuples marshal can store."""
+    if isinstance(value, dict):
+        return {_tag_dates(k): _tag_dates(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_tag_dates(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_tag_dates(v) for v in value)
+    if isinstance(value, datetime.datetime):
+        return (_DATETIME_TAG, value.isoformat())
+    if isinstance(value, datetime.date):
+        return (_DATE_TAG, value.isoformat())
+    return value
+
+
+def _untag_dates(value):
+    """Inverse of _tag_dates."""
+    if isinstance(value, dict):
+        return {_untag_dates(k): _untag_dates(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_untag_dates(v) for v in value]
+    if isinstance(value, tuple):
+        if len(value) == 2 and value[0] == _DATETIME_TAG:
+            return datetime.datetime.fromisoformat(value[1])
+        if len(value) == 2 and value[0] == _DATE_TAG:
+            return datetime.date.fromisoformat(value[1])
+        return tuple(_untag_dates(v) for v in value)
+    return value
+
+
+def _dump_cache_file(path: Path, entry: tuple) -> None:
+    """Atomically write a cache file.
+
+    Cache files live in the project directory, so they are written with
+    marshal, which unlike pickle cannot run code when loaded. Dates are
+    tagged only when the entry holds any, so the usual load stays a single
+    marshal.loads.
+    """
+    try:
+        data = marshal.dumps((False, entry))
+    except ValueError:
+        data = marshal.dumps((True, _tag_dates(entry)))
+    ensure_cache_dir()
+    write_atomic(path, data)
+
+
+def _load_cache_file(path: Path, version: int, length: int) -> tuple | None:
+    """Read a cache file written by _dump_cache_file, or None if missing, unreadable or of another layout."""
+    try:
+        tagged, entry = marshal.loads(path.read_bytes())
+        if tagged:
+            entry = _untag_dates(entry)
+    except Exception:  # noqa: BLE001
+        # Any unreadable file (truncated, from another version, ...) just means rebuilding it
+        return None
+    if not isinstance(entry, tuple) or len(entry) != length or entry[0] != version:
+        return None
+    return entry
+
+
+def _write_cache(path: Path, stat: os.stat_result, digest: str, data: dict, fragments: dict) -> None:
+    """Atomically write the compiled snapshot for a YAML file."""
+    try:
+        _dump_cache_file(_cache_path(path), (_CACHE_VERSION, stat.st_size, stat.st_mtime_ns, digest, data, fragments))
+    except OSError:
+        # The cache is an optimization; a read-only checkout still works.
+        pass
+
+
+def _read_cache(path: Path) -> tuple | None:
+    """Read the compiled snapshot for a YAML file, or None if missing or unreadable."""
+    return _load_cache_file(_cache_path(path), _CACHE_VERSION, 6)
+
+
+def reset_parse_stats() -> None:
+    """Reset the parsed/reused slide counters."""
+    parse_stats["parsed"] = 0
+    parse_stats["reused"] = 0
+
+
+def keep_resident() -> None:
+    """Keep parsed registry files in memory between loads, for long-running processes like slidedeck serve."""
+    global _resident
+    if _resident is None:
+        _resident = {}
+
+
+def _detached(data):
+    """Copy of parsed YAML whose top-level dict and lists callers can modify freely.
+
+    Slide dicts are shared with the resident copy; no caller modifies them in place.
+    """
+    if not isinstance(data, dict):
+        return data
+    return {key: list(value) if isinstance(value, list) else value for key, value in data.items()}
+
+
+def _remember(path: Path, stat: os.stat_result, data) -> None:
+    if _resident is not None:
+        _resident[str(path.resolve())] = (stat.st_size, stat.st_mtime_ns, _detached(data))
+
+
+def _slide_count(data) -> int:
+    return len(data.get("slides") or []) if isinstance(data, dict) else 0
+
+
+def _split_slides(text: str) -> tuple[str, list[str]] | None:
+    """Split a registry document into the rest of the document and one text fragment per slide.
+
+    Returns None unless the slides are a plain block list under a top-level
+    "slides:" key, which is what yaml.dump writes and hand edits keep.
+    """
+    lines = text.splitlines(keepends=True)
+    start = next((i for i, line in enumerate(lines) if line.rstrip() == "slides:"), None)
+    if start is None or any(line.startswith("%") for line in lines[:start]):
+        return None
+
+    prefix = None
+    pieces: list[list[str]] = []
+    end = start + 1
+    while end < len(lines):
+        line = lines[end]
+        stripped = line.strip()
+        # Before the first slide a comment cannot be inside a block scalar, so it is dropped like blank lines
+        if not stripped or stripped.startswith("#"):
+            if pieces:
+                pieces[-1].append(line)
+            end += 1
+            continue
+        if prefix is None:
+            prefix = line[: len(line) - len(line.lstrip(" "))]
+        if line.startswith(prefix + "- ") or line.rstrip() == prefix + "-":
+            pieces.append([line])
+        elif line.startswith(prefix + " ") and pieces:
+            pieces[-1].append(line)
+        else:
+            break
+        end += 1
+
+    rest = "".join(lines[:start]) + "slides: []\n" + "".join(lines[end:])
+    return rest, ["".join(piece) for piece in pieces]
+
+
+def _parse_incremental(raw: bytes, fragments: dict) -> tuple[dict, dict] | None:
+    """Parse a registry, re-parsing only slides whose text changed since the last snapshot.
+
+    fragments maps a hash of each slide's YAML text to its parsed entry. Returns
+    the parsed document and the new fragment map, or None if the document has
+    to be parsed as a whole (unusual layout, anchors shared between slides).
+    """
+    try:
+        split = _split_slides(raw.decode("utf-8"))
+        if split is None:
+            return None
+        rest, pieces = split
+
+        data = yaml.safe_load(rest)
+        if not isinstance(data, dict):
+            return None
+
+        new_fragments: dict[bytes, dict] = {}
+        slides = []
+        parsed = 0
+        for piece in pieces:
+            key = hashlib.sha1(piece.encode("utf-8")).digest()
+            # Identical pieces are parsed separately so no two slides share a dict
+            item = fragments.get(key) if key not in new_fragments else None
+            if item is None:
+                items = yaml.safe_load(piece)
+                if not isinstance(items, list) or len(items) != 1:
+                    return None
+                item = items[0]
+                parsed += 1
+            new_fragments[key] = item
+            slides.append(item)
+    except (UnicodeDecodeError, yaml.YAMLError):
+        return None
+
+    data["slides"] = slides
+    parse_stats["parsed"] += parsed
+    parse_stats["reused"] += len(slides) - parsed
+    return data, new_fragments
+
+
+def load_yaml_cached(path: Path) -> dict:
+    """Parse a YAML file, reusing the compiled snapshot when the file is unchanged.
+
+    The snapshot is keyed by size, mtime and content hash. A matching size and
+    mtime is trusted directly; otherwise the content hash decides whether the
+    file really changed. When it did, only slides whose text changed are parsed
+    again and the rest are reused from the snapshot.
+
+    After keep_resident(), the parsed data is also kept in memory and reused
+    while the file's size and mtime are unchanged, without reading the snapshot.
+    """
+    stat = path.stat()
+    if _resident is not None:
+        resident = _resident.get(str(path.resolve()))
+        if resident is not None and resident[0] == stat.st_size and resident[1] == stat.st_mtime_ns:
+            parse_stats["reused"] += _slide_count(resident[2])
+            return _detached(resident[2])
+
+    entry = _read_cache(path)
+    if entry is not None and entry[1] == stat.st_size and entry[2] == stat.st_mtime_ns:
+        parse_stats["reused"] += _slide_count(entry[4])
+        _remember(path, stat, entry[4])
+        return entry[4]
+
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if entry is not None and entry[3] == digest:
+        data, fragments = entry[4], entry[5]
+        parse_stats["reused"] += _slide_count(data)
+    else:
+        result = _parse_incremental(raw, entry[5] if entry is not None else {})
+        if result is None:
+            data, fragments = yaml.safe_load(raw), {}
+            parse_stats["parsed"] += _slide_count(data)
+        else:
+            data, fragments = result
+    _write_cache(path, stat, digest, data, fragments)
+    _remember(path, stat, data)
+    return data
+
+
+def journal_path(path: Path = REGISTRY_PATH) -> Path:
+    """Location of the append-only journal for a registry (slides.yaml -> slides.journal)."""
+    return path.with_suffix(".journal")
+
+
+def read_journal(path: Path = REGISTRY_PATH) -> list[dict]:
+    """Read slide entries appended to the journal since the last compaction."""
+    try:
+        with open(journal_path(path), encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # A torn final line from an interrupted append; the rest is intact.
+            continue
+    return entries
+
+
+def _journal_text(entries: list[dict]) -> str:
+    return "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+
+
+@contextmanager
+def journal_lock(path: Path = REGISTRY_PATH) -> Iterator[None]:
+    """Hold an exclusive lock on the journal of a registry while the block runs.
+
+    Appends and the removal of folded entries both take it, so slides
+    appended while another process compacts the journal are kept. Nothing is
+    locked without fcntl (Windows) or a writable cache directory.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        ensure_cache_dir()
+        lock_file = open(CACHE_DIR / ("journal_" + _path_key(path) + ".lock"), "a")  # noqa: SIM115
+    except OSError:
+        yield
+        return
+    with lock_file:
+        # Released when the file is closed
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def unique_slide_id(slide_id: str, existing_ids) -> str:
+    """Append a counter to slide_id until it does not collide with existing_ids."""
+    if slide_id not in existing_ids:
+        return slide_id
+    counter = 2
+    while slide_id + "_" + str(counter) in existing_ids:
+        counter += 1
+    return slide_id + "_" + str(counter)
+
+
+def append_journal(entries: list[dict], path: Path = REGISTRY_PATH) -> None:
+    """Append slide entries to the journal without rewriting slides.yaml.
+
+    IDs are checked again under the journal lock: an entry whose ID another
+    process took since it was generated gets a counter appended, in place.
+    """
+    with journal_lock(path):
+        taken = load_slide_index(path)[1]
+        for entry in entries:
+            entry["id"] = unique_slide_id(entry["id"], taken)
+            taken.add(entry["id"])
+        with open(journal_path(path), "a", encoding="utf-8") as f:
+            f.write(_journal_text(entries))
+
+
+def _was_saved(entry: dict, by_id: dict[str, dict]) -> bool:
+    """Whether a journal entry is among the saved slides, also under an ID load_registry renumbered it to."""
+    candidate = entry["id"]
+    counter = 2
+    while candidate in by_id:
+        if by_id[candidate] == dict(entry, id=candidate):
+            return True
+        candidate = entry["id"] + "_" + str(counter)
+        counter += 1
+    return False
+
+
+def _fold_journal(saved: list[dict], path: Path) -> None:
+    """Remove the journal entries that were just saved, keeping any appended since they were read."""
+    with journal_lock(path):
+        journaled = read_journal(path)
+        by_id = {s["id"]: s for s in saved} if journaled else {}
+        remaining = [e for e in journaled if not _was_saved(e, by_id)]
+        if remaining:
+            write_atomic(journal_path(path), _journal_text(remaining).encode("utf-8"))
+        else:
+            journal_path(path).unlink(missing_ok=True)
+
+
+def shard_dir(path: Path = REGISTRY_PATH) -> Path:
+    """Directory holding per-topic shards for a sharded registry (slides.yaml -> slides.d)."""
+    return path.with_suffix(".d")
+
+
+def is_sharded(path: Path = REGISTRY_PATH) -> bool:
+    """Whether slides live in slides.d/<topic>.yaml with slides.yaml as the index."""
+    return shard_dir(path).is_dir()
+
+
+def _shard_path(topic_id: str, path: Path) -> Path:
+    return shard_dir(path) / (topic_id + ".yaml")
+
+
+def _dump_yaml(data: dict, target: Path) -> None:
+    """Write data as YAML and prime its compiled cache."""
+    text = yaml.dump(data, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    raw = text.encode("utf-8")
+    # Atomic, so that concurrent readers such as journal appends never see a partial registry
+    write_atomic(target, raw)
+
+    # Prime the cache so neither the next load nor the next edit re-parses what was just written.
+    fragments = {}
+    slides = data.get("slides") or []
+    split = _split_slides(text) if slides else None
+    if split is not None and len(split[1]) == len(slides):
+        fragments = {hashlib.sha1(piece.encode("utf-8")).digest(): s for piece, s in zip(split[1], slides)}
+    stat = target.stat()
+    _write_cache(target, stat, hashlib.sha256(raw).hexdigest(), data, fragments)
+    _remember(target, stat, data)
+
+
+def _load_shards(index: dict, path: Path, topics: set[str] | None) -> list[dict]:
+    """Load slides from the per-topic shards, parsing only the requested topics."""
+    directory = shard_dir(path)
+    shard_topics = [t["id"] for t in index.get("topics", [])]
+    # Shards for topics missing from the index still load, after the known ones.
+    known = set(shard_topics)
+    shard_topics.extend(sorted(p.stem for p in directory.glob("*.yaml") if p.stem not in known))
+
+    slides = []
+    for topic_id in shard_topics:
+        if topics is not None and topic_id not in topics:
+            continue
+        shard = _shard_path(topic_id, path)
+        if shard.exists():
+            slides.extend((load_yaml_cached(shard) or {}).get("slides") or [])
+    return slides
+
+
+def load_registry(path: Path = REGISTRY_PATH, topics: set[str] | None = None) -> dict:
+    """Load the slides registry, merging any journaled slides.
+
+    If topics is given, only slides in those topics are returned; with a
+    sharded registry, only those topics' shards are read.
+    """
+    data = load_yaml_cached(path)
+    if is_sharded(path):
+        data["slides"] = _load_shards(data, path, topics)
+    elif topics is not None:
+        data["slides"] = [s for s in data.get("slides") or [] if s["topic"] in topics]
+
+    journaled = read_journal(path)
+    if journaled:
+        slides = data.setdefault("slides", [])
+        by_id = {s["id"]: s for s in slides}
+        taken = set(by_id)
+        for entry in journaled:
+            if by_id.get(entry["id"]) == entry:
+                # Already folded into slides.yaml by an interrupted compaction
+                continue
+            if entry["id"] in taken:
+                # Written by a concurrent writer with a stale view of the IDs
+                entry = dict(entry, id=unique_slide_id(entry["id"], taken))
+            taken.add(entry["id"])
+            if topics is None or entry["topic"] in topics:
+                slides.append(entry)
+    return data
+
+
+def _registry_signature(path: Path) -> tuple:
+    """Size and mtime of slides.yaml and any shards, to tell whether their slide IDs may have changed."""
+    files = [path]
+    if is_sharded(path):
+        files.extend(sorted(shard_dir(path).glob("*.yaml")))
+    signature = []
+    for f in files:
+        stat = f.stat()
+        signature.append((str(f), stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def _id_index_path(path: Path) -> Path:
+    """Location of the slide ID index for a registry."""
+    return CACHE_DIR / ("ids_" + _path_key(path) + ".marshal")
+
+
+def _read_id_index(path: Path) -> tuple | None:
+    return _load_cache_file(_id_index_path(path), _ID_INDEX_VERSION, 6)
+
+
+def _write_id_index(path: Path, index: tuple) -> None:
+    try:
+        _dump_cache_file(_id_index_path(path), index)
+    except OSError:
+        pass
+
+
+def load_slide_index(path: Path = REGISTRY_PATH) -> tuple[list[dict], set[str]]:
+    """Topics of the registry and the IDs of all its slides, journal included, without loading the slides.
+
+    The IDs in slides.yaml (or its shards) are kept in a small index under the
+    cache directory while those files are unchanged. The journal only grows
+    until it is folded, which rewrites slides.yaml, so only the lines appended
+    since the index was last updated are read.
+    """
+    signature = _registry_signature(path)
+    key = _path_key(path)
+    cached = index = _id_indexes.get(key) or _read_id_index(path)
+    if index is None or index[1] != signature:
+        data = load_yaml_cached(path)
+        slides = _load_shards(data, path, None) if is_sharded(path) else data.get("slides") or []
+        # (version, signature, topics, yaml IDs, (journal inode, bytes read), journal IDs)
+        index = (_ID_INDEX_VERSION, signature, data.get("topics") or [], {s["id"] for s in slides}, (0, 0), set())
+    journal_ids = index[5]
+    inode, offset = index[4]
+
+    try:
+        with open(journal_path(path), "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != inode or stat.st_size < offset:
+                journal_ids, offset = set(), 0
+            if stat.st_size > offset:
+                f.seek(offset)
+                tail = f.read()
+                # A line still being appended is read once it is complete
+                end = tail.rfind(b"\n") + 1
+                journal_ids = set(journal_ids)
+                for line in tail[:end].splitlines():
+                    try:
+                        journal_ids.add(json.loads(line)["id"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                offset += end
+            inode = stat.st_ino
+    except FileNotFoundError:
+        journal_ids, inode, offset = set(), 0, 0
+
+    if index is not cached or index[4] != (inode, offset):
+        index = index[:4] + ((inode, offset), journal_ids)
+        _write_id_index(path, index)
+    _id_indexes[key] = index
+    return index[2], index[3] | journal_ids
+
+
+def compact_registry(path: Path = REGISTRY_PATH) -> int:
+    """Fold the journal back into slides.yaml. Returns the number of entries folded."""
+    journaled = read_journal(path)
+    if journaled:
+        save_registry(load_registry(path), path, topics={e["topic"] for e in journaled})
+    return len(journaled)
+
+
+def save_registry(data: dict, path: Path = REGISTRY_PATH, topics: set[str] | None = None) -> None:
+    """Save the slides registry.
+
+    The data is expected to come from load_registry, so it already contains the
+    journaled slides; they are removed from the journal once everything is
+    written.
+
+    For a sharded registry, topics limits the write to those topics' shards
+    (plus any with journaled slides); otherwise the index and every shard are
+    rewritten. topics is ignored for a single slides.yaml.
+    """
+    if not is_sharded(path):
+        _dump_yaml(data, path)
+        _fold_journal(data.get("slides") or [], path)
+        return
+
+    slides_by_topic: dict[str, list] = {}
+    for slide in data.get("slides") or []:
+        slides_by_topic.setdefault(slide["topic"], []).append(slide)
+
+    if topics is None:
+        _dump_yaml({k: v for k, v in data.items() if k != "slides"}, path)
+        for stale in shard_dir(path).glob("*.yaml"):
+            if stale.stem not in slides_by_topic:
+                stale.unlink()
+        topics = set(slides_by_topic)
+    else:
+        topics = set(topics) | {e["topic"] for e in read_journal(path)}
+
+    for topic_id in topics:
+        _dump_yaml({"slides": slides_by_topic.get(topic_id, [])}, _shard_path(topic_id, path))
+    _fold_journal([s for topic_id in topics for s in slides_by_topic.get(topic_id, [])], path)
+
+
+def shard_registry(path: Path = REGISTRY_PATH) -> int:
+    """Split slides.yaml into slides.d/<topic>.yaml shards. Returns the number of shards written."""
+    data = load_registry(path)
+    shard_dir(path).mkdir(exist_ok=True)
+    save_registry(data, path)
+    return len({s["topic"] for s in data.get("slides") or []})
+
+
+def unshard_registry(path: Path = REGISTRY_PATH) -> int:
+    """Merge slides.d/ shards back into a single slides.yaml. Returns the number of slides."""
+    data = load_registry(path)
+    _dump_yaml(data, path)
+    directory = shard_dir(path)
+    for shard in directory.glob("*.yaml"):
+        shard.unlink()
+    directory.rmdir()
+    _fold_journal(data.get("slides") or [], path)
+    return len(data.get("slides") or [])
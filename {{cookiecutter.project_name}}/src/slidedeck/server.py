@@ -0,0 +1,159 @@
+"""Long-running server that executes slidedeck commands in a warm process.
+
+The server listens on a Unix socket under .slidedeck/ and runs each command
+forwarded by slidedeck.client through the regular click CLI, one at a time,
+streaming its output back. Modules stay imported between commands and parsed
+registry files stay in memory, reused for as long as they are unchanged on
+disk, so edits made outside the server are still picked up.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import traceback
+
+import click
+
+from slidedeck import registry
+from slidedeck.client import LOCAL_COMMANDS, SOCKET_PATH, connect, send_request
+
+
+class _MessageStream(io.TextIOBase):
+    """Text stream that sends each write to the client as a JSON line."""
+
+    # click checks these to decide whether a stream needs re-wrapping
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, wfile, name: str):
+        self.wfile = wfile
+        self.name = name
+        self.connected = True
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError("write() argument must be str, not " + type(text).__name__)
+        if text:
+            self.send({self.name: text})
+        return len(text)
+
+    def send(self, message: dict) -> None:
+        # A client that went away must not interrupt the command it started
+        if not self.connected:
+            return
+        try:
+            self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        except OSError:
+            self.connected = False
+
+
+def run_command(argv: list[str]) -> int:
+    """Run a slidedeck command line in this process and return its exit code."""
+    from slidedeck.cli import cli
+
+    try:
+        cli.main(args=argv, prog_name="slidedeck")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        click.echo(e.code, err=True)
+        return 1
+    except Exception:  # noqa: BLE001
+        # The server outlives a crashing command; the traceback goes to the client and the server's own stderr
+        traceback.print_exc()
+        traceback.print_exc(file=sys.__stderr__)
+        return 1
+    return 0
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        stdout = _MessageStream(self.wfile, "stdout")
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        # Relative paths in the command must resolve against this project
+        if request.get("cwd") != os.getcwd():
+            stdout.send({"refused": "serving " + os.getcwd()})
+            return
+        if request.get("stop"):
+            stdout.send({"exit_code": 0})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+
+        argv = request.get("argv") or []
+        if argv and argv[0] in LOCAL_COMMANDS:
+            stdout.send({"refused": argv[0] + " runs locally"})
+            return
+        stderr = _MessageStream(self.wfile, "stderr")
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = run_command(argv)
+        stdout.send({"exit_code": exit_code})
+
+
+def _preload() -> None:
+    """Import the command modules up front so the first forwarded command is fast too."""
+    import slidedeck.add
+    import slidedeck.build
+    import slidedeck.cli
+    import slidedeck.history
+    import slidedeck.store  # noqa: F401
+
+
+def _stop_on_sigterm(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def serve() -> None:
+    """Serve commands for the project in the current directory until interrupted."""
+    sock = connect()
+    if sock is not None:
+        sock.close()
+        click.echo("Error: slidedeck serve is already running for this project.", err=True)
+        raise SystemExit(1)
+    registry.ensure_cache_dir()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(SOCKET_PATH)
+
+    registry.keep_resident()
+    _preload()
+    # Only the current user may connect: the server runs arbitrary slidedeck commands
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(SOCKET_PATH, _CommandHandler)
+    finally:
+        os.umask(umask)
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
+
+    click.echo("Serving slidedeck commands on " + SOCKET_PATH + " (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(SOCKET_PATH)
+    click.echo("Server stopped.")
+
+
+def stop_server() -> bool:
+    """Stop the server running for the current directory. Returns False if none is running."""
+    sock = connect()
+    if sock is None:
+        return False
+    with sock:
+        send_request(sock, {"stop": True, "cwd": os.getcwd()})
+        for line in sock.makefile("rb"):
+            return "exit_code" in json.loads(line)
+    return False
@@ -0,0 +1,246 @@
+"""Optional SQLite storage backend for large registries.
+
+When slides.db exists it replaces slides.yaml as the working registry, and
+slides.yaml becomes the import/export format. Slides are stored as JSON rows
+with indexed id, topic, created and tag columns, so build and add query the
+indexes instead of materializing the whole deck.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+from slidedeck.registry import REGISTRY_PATH, load_registry, save_registry, unique_slide_id
+
+DB_PATH = Path("slides.db")
+
+
+class DuplicateSlideIdError(ValueError):
+    """The registry holds more than one slide with the same ID; the message lists them."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS topics (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slides (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL,
+    created TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_slides_topic ON slides (topic, created);
+CREATE INDEX IF NOT EXISTS idx_slides_created ON slides (created);
+CREATE TABLE IF NOT EXISTS slide_tags (
+    slide_id TEXT NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_slide_tags_tag ON slide_tags (tag);
+CREATE INDEX IF NOT EXISTS idx_slide_tags_slide ON slide_tags (slide_id);
+"""
+
+
+def is_enabled(db_path: Path = DB_PATH) -> bool:
+    """Whether the SQLite backend is in use for this project."""
+    return db_path.exists()
+
+
+def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """Open the registry database, creating the schema if needed."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _yaml_signature(yaml_path: Path) -> str:
+    """Size and mtime of slides.yaml, used to detect edits made after import."""
+    try:
+        stat = yaml_path.stat()
+    except FileNotFoundError:
+        return ""
+    return str(stat.st_size) + ":" + str(stat.st_mtime_ns)
+
+
+def insert_slides(conn: sqlite3.Connection, slides: list[dict]) -> None:
+    """Insert slide entries and their tags.
+
+    An entry whose ID another writer inserted since it was generated gets a
+    counter appended, in place.
+    """
+    if not conn.in_transaction:
+        # Take the write lock before checking IDs, so no other writer can insert in between
+        conn.execute("BEGIN IMMEDIATE")
+    taken = SlideIdLookup(conn)
+    for slide in slides:
+        slide["id"] = unique_slide_id(slide["id"], taken)
+        taken.add(slide["id"])
+    conn.executemany(
+        "INSERT INTO slides (id, topic, created, data) VALUES (?, ?, ?, ?)",
+        [(s["id"], s["topic"], str(s["created"]), json.dumps(s, default=str)) for s in slides],
+    )
+    conn.executemany(
+        "INSERT INTO slide_tags (slide_id, tag) VALUES (?, ?)",
+        [(s["id"], tag) for s in slides for tag in s.get("tags") or []],
+    )
+
+
+def import_yaml(yaml_path: Path = REGISTRY_PATH, db_path: Path = DB_PATH) -> int:
+    """Replace the database contents with slides.yaml. Returns the number of slides imported.
+
+    Raises DuplicateSlideIdError, leaving the database untouched, if two
+    slides share an ID.
+    """
+    registry = load_registry(yaml_path)
+    slides = registry.get("slides", [])
+    seen: set[str] = set()
+    duplicates: set[str] = set()
+    for slide in slides:
+        if slide["id"] in seen:
+            duplicates.add(slide["id"])
+        seen.add(slide["id"])
+    if duplicates:
+        listed = ", ".join(sorted(duplicates)[:10]) + (", ..." if len(duplicates) > 10 else "")
+        message = str(len(duplicates)) + " slide ID(s) are used more than once in " + str(yaml_path) + ": " + listed
+        raise DuplicateSlideIdError(message)
+    with connect(db_path) as conn:
+        conn.execute("DELETE FROM meta")
+        conn.execute("DELETE FROM topics")
+        conn.execute("DELETE FROM slides")
+        conn.execute("DELETE FROM slide_tags")
+        meta = {k: v for k, v in registry.items() if k not in ("topics", "slides")}
+        conn.execute("INSERT INTO meta (key, value) VALUES ('registry', ?)", (json.dumps(meta, default=str),))
+        conn.executemany(
+            "INSERT INTO topics (id, position, data) VALUES (?, ?, ?)",
+            [(t["id"], i, json.dumps(t)) for i, t in enumerate(registry["topics"])],
+        )
+        insert_slides(conn, slides)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('yaml_signature', ?)", (_yaml_signature(yaml_path),))
+    conn.close()
+    return len(slides)
+
+
+def load_full_registry(conn: sqlite3.Connection) -> dict:
+    """Materialize the whole registry as the dict slides.yaml would hold."""
+    registry = load_meta(conn)
+    registry["slides"] = [json.loads(row[0]) for row in conn.execute("SELECT data FROM slides ORDER BY seq")]
+    return registry
+
+
+def export_yaml(yaml_path: Path = REGISTRY_PATH, db_path: Path = DB_PATH) -> int:
+    """Write the database contents to slides.yaml. Returns the number of slides exported."""
+    with connect(db_path) as conn:
+        registry = load_full_registry(conn)
+        save_registry(registry, yaml_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('yaml_signature', ?)", (_yaml_signature(yaml_path),)
+        )
+    conn.close()
+    return len(registry["slides"])
+
+
+def yaml_changed_since_sync(conn: sqlite3.Connection, yaml_path: Path = REGISTRY_PATH) -> bool:
+    """Whether slides.yaml was edited after the last import or export."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'yaml_signature'").fetchone()
+    return row is not None and row[0] != _yaml_signature(yaml_path)
+
+
+def load_meta(conn: sqlite3.Connection) -> dict:
+    """Load the deck title and topics without touching the slides table."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'registry'").fetchone()
+    registry = json.loads(row[0]) if row else {}
+    registry["topics"] = [json.loads(r[0]) for r in conn.execute("SELECT data FROM topics ORDER BY position")]
+    return registry
+
+
+def _slide_filter(topics: set[str] | None, tags: set[str] | None = None) -> tuple[list[str], list[str]]:
+    """SQL conditions and parameters restricting slides to the given topics and to slides with any of the tags."""
+    conditions: list[str] = []
+    params: list[str] = []
+    if topics is not None:
+        conditions.append("topic IN (" + ", ".join("?" for _ in topics) + ")")
+        params.extend(sorted(topics))
+    if tags is not None:
+        conditions.append("id IN (SELECT slide_id FROM slide_tags WHERE tag IN (" + ", ".join("?" for _ in tags) + "))")
+        params.extend(sorted(tags))
+    return conditions, params
+
+
+def _where(conditions: list[str]) -> str:
+    return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+
+def count_slides(conn: sqlite3.Connection, topics: set[str] | None = None, tags: set[str] | None = None) -> int:
+    """Number of slides in the registry, optionally restricted to some topics and tags."""
+    conditions, params = _slide_filter(topics, tags)
+    return conn.execute("SELECT COUNT(*) FROM slides" + _where(conditions), params).fetchone()[0]
+
+
+def iter_topic_sections(
+    conn: sqlite3.Connection,
+    topic_list: list[dict],
+    topics: set[str] | None = None,
+    tags: set[str] | None = None,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Yield (topic_id, slides) in display order, newest first within each topic.
+
+    Matches build.group_slides_by_topic: topics sort by their order (unknown
+    topics last, by first appearance) and ties keep insertion order. With
+    tags, only slides carrying at least one of them are included.
+    """
+    topic_order = {t["id"]: t["order"] for t in topic_list}
+    conditions, params = _slide_filter(topics, tags)
+    first_seen = conn.execute(
+        "SELECT topic, MIN(seq) FROM slides" + _where(conditions) + " GROUP BY topic", params
+    ).fetchall()
+    first_seen.sort(key=lambda row: (topic_order.get(row[0], 999), row[1]))
+    conditions, params = _slide_filter(None, tags)
+    for topic_id, _ in first_seen:
+        rows = conn.execute(
+            "SELECT data FROM slides" + _where(["topic = ?", *conditions]) + " ORDER BY created DESC, seq",
+            [topic_id, *params],
+        )
+        yield topic_id, [json.loads(row[0]) for row in rows]
+
+
+def recent_slides(
+    conn: sqlite3.Connection,
+    count: int,
+    topics: set[str] | None = None,
+    tags: set[str] | None = None,
+) -> list[dict]:
+    """The most recently created slides, newest first."""
+    conditions, params = _slide_filter(topics, tags)
+    rows = conn.execute(
+        "SELECT data FROM slides" + _where(conditions) + " ORDER BY created DESC, seq LIMIT ?", params + [count]
+    )
+    return [json.loads(row[0]) for row in rows]
+
+
+def figure_paths(conn: sqlite3.Connection) -> list[str]:
+    """Figure paths of all slides that have one."""
+    rows = conn.execute("SELECT json_extract(data, '$.figure') FROM slides ORDER BY seq")
+    return [row[0] for row in rows if row[0]]
+
+
+class SlideIdLookup:
+    """Set-like view of slide IDs backed by the unique index on slides.id."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.pending: set[str] = set()
+
+    def __contains__(self, slide_id: str) -> bool:
+        if slide_id in self.pending:
+            return True
+        return self.conn.execute("SELECT 1 FROM slides WHERE id = ?", (slide_id,)).fetchone() is not None
+
+    def add(self, slide_id: str) -> None:
+        self.pending.add(slide_id)
@@ -0,0 +1,278 @@
+"""Save matplotlib figures into the deck without blocking the caller.
+
+    import slidedeck
+
+    slidedeck.savefig(fig, topic="results", caption="Validation loss")
+
+savefig() renders the figure to raw pixels on the calling thread, since
+matplotlib figures are not thread-safe, and hands PNG encoding, the file
+write and registering the slide to a thread pool. Figures are encoded in
+parallel but written and registered in the order savefig() was called.
+At most MAX_PENDING figures wait at a time; beyond that savefig() blocks
+until one is done, so a fast loop cannot hold unbounded memory. Pending
+figures are flushed when the interpreter exits, and flush() waits for
+them explicitly.
+
+Slides are appended to slides.journal, as with 'slidedeck add --journal',
+in one batch per burst: once no figure is pending (or MAX_PENDING have
+been written), the figures written since the last batch are registered
+together.
+"""
+
+import atexit
+import io
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import date
+from pathlib import Path
+
+from slidedeck.add import FigureError, generate_slide_id, infer_title_from_filename, resolve_topic
+from slidedeck.deck import Deck
+from slidedeck.registry import write_atomic
+
+DEFAULT_DPI = 150
+WORKERS = 2
+MAX_PENDING = 16
+
+
+class _Writer:
+    """Thread pool that encodes figures in parallel, then writes and registers them in order.
+
+    Figures are written one at a time in call order. Those written since the
+    previous registration are registered in a single Deck batch once no
+    figure is pending, or once max_pending of them have piled up.
+    """
+
+    def __init__(self, workers: int = WORKERS, max_pending: int = MAX_PENDING):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slidedeck-savefig")
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.max_pending = max_pending
+        self.deck = Deck(journal=True)
+        self.lock = threading.Lock()
+        self.pending: set[Future] = set()
+        self.claimed: set[Path] = set()
+        self.errors: list[Exception] = []
+        # Written figures waiting to be registered, as (path, slide) pairs
+        self.unregistered: list[tuple[Path, dict]] = []
+        # Set once the most recently submitted figure is done: written (and registered, if it ended a burst) or failed
+        self.last_registered: threading.Event | None = None
+        self._topic_ids: set[str] | None = None
+
+    def topic_ids(self) -> set[str]:
+        # Read once, so savefig() does not touch slides.yaml on every call
+        if self._topic_ids is None:
+            self._topic_ids = self.deck.topic_ids()
+        return self._topic_ids
+
+    def claim(self, path: Path, unique: bool) -> Path:
+        """Reserve path for a pending figure.
+
+        With unique=True a counter is appended if a file or another pending
+        figure already uses the path.
+        """
+        with self.lock:
+            candidate = path
+            counter = 2
+            while unique and (candidate in self.claimed or candidate.exists()):
+                candidate = path.with_name(path.stem + "_" + str(counter) + path.suffix)
+                counter += 1
+            self.claimed.add(candidate)
+        return candidate
+
+    def submit(self, path: Path, encode: Callable[[], bytes], slide: dict) -> None:
+        self.slots.acquire()
+        registered = threading.Event()
+        with self.lock:
+            previous, self.last_registered = self.last_registered, registered
+            future = self.pool.submit(self._write, path, encode, slide, previous, registered)
+            self.pending.add(future)
+        future.add_done_callback(lambda f: self._done(f, path))
+
+    def _write(
+        self,
+        path: Path,
+        encode: Callable[[], bytes],
+        slide: dict,
+        previous: threading.Event | None,
+        registered: threading.Event,
+    ) -> None:
+        try:
+            try:
+                data = encode()
+            finally:
+                # Even a failed figure waits its turn, so only one thread writes and registers at a time
+                if previous is not None:
+                    previous.wait()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, data)
+            self.unregistered.append((path, slide))
+        except Exception as e:  # noqa: BLE001
+            # Recorded before the future completes: done callbacks run after wait() returns to flush()
+            with self.lock:
+                self.errors.append(e)
+        finally:
+            try:
+                with self.lock:
+                    burst_done = self.last_registered is registered
+                if burst_done or len(self.unregistered) >= self.max_pending:
+                    self._register()
+            finally:
+                registered.set()
+
+    def _register(self) -> None:
+        """Register the figures written since the last call, in one save of the registry."""
+        figures, self.unregistered = self.unregistered, []
+        if not figures:
+            return
+        errors = []
+        try:
+            with self.deck.batch():
+                for path, slide in figures:
+                    try:
+                        self.deck.add(path, **slide)
+                    except Exception as e:  # noqa: BLE001
+                        errors.append(e)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+        with self.lock:
+            self.errors.extend(errors)
+
+    def _done(self, future: Future, path: Path) -> None:
+        with self.lock:
+            self.pending.discard(future)
+            self.claimed.discard(path)
+        self.slots.release()
+
+    def flush(self) -> None:
+        with self.lock:
+            pending = list(self.pending)
+        wait(pending)
+        with self.lock:
+            errors, self.errors = self.errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.pool.shutdown()
+
+
+_writer: _Writer | None = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> _Writer:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = _Writer()
+        return _writer
+
+
+def flush() -> None:
+    """Wait until every figure passed to savefig() is written and registered.
+
+    Re-raises the first error a background write hit since the last flush.
+    """
+    if _writer is not None:
+        _writer.flush()
+
+
+def close() -> None:
+    """Flush pending figures, then stop the background threads.
+
+    Re-raises errors like flush(). A later savefig() starts new threads.
+    Called when the interpreter exits.
+    """
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+
+atexit.register(close)
+
+
+def _figure_title(fig) -> str:
+    """The figure's suptitle, or else the title of its first titled axes."""
+    suptitle = getattr(fig, "_suptitle", None)
+    if suptitle is not None and suptitle.get_text():
+        return suptitle.get_text()
+    for ax in fig.axes:
+        if ax.get_title():
+            return ax.get_title()
+    return ""
+
+
+def _png_from_rgba(pixels: bytes, size: tuple[int, int]) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.frombuffer("RGBA", size, pixels, "raw", "RGBA", 0, 1).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _render(fig, dpi: int) -> Callable[[], bytes]:
+    """Rasterize fig now; return a function that encodes the result as PNG."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="rgba", dpi=dpi)
+    pixels = buffer.getvalue()
+    # matplotlib sizes its canvas as int(inches * dpi)
+    size = (int(fig.get_figwidth() * dpi), int(fig.get_figheight() * dpi))
+    if len(pixels) != size[0] * size[1] * 4:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi)
+        png = buffer.getvalue()
+        return lambda: png
+    return lambda: _png_from_rgba(pixels, size)
+
+
+def savefig(
+    fig,
+    name: str | Path | None = None,
+    topic: str | None = None,
+    title: str | None = None,
+    caption: str = "",
+    notes: str = "",
+    tags: list[str] | None = None,
+    dpi: int = DEFAULT_DPI,
+) -> Path:
+    """Save a matplotlib figure as a PNG in the deck and register it as a slide, in the background.
+
+    name is a file name placed in figures/<topic>/, or a path whose topic is
+    inferred like 'slidedeck add' does. Without a name, the file is named
+    after the slide ID, made unique with a counter. The title defaults to the
+    file name, or without a name, to the figure's title. Returns the path the
+    PNG is written to. An invalid name or topic raises FigureError right
+    away; errors in the background are re-raised by flush().
+    """
+    writer = _get_writer()
+    auto_named = name is None
+    if auto_named:
+        title = title or _figure_title(fig) or "Figure"
+        name = generate_slide_id(title, date.today().isoformat())
+    path = Path(name)
+    if path.suffix.lower() != ".png":
+        if path.suffix:
+            raise FigureError("savefig only writes PNG figures, not '" + path.suffix + "'.")
+        path = path.with_name(path.name + ".png")
+    if path.parent == Path("."):
+        if topic is None:
+            raise FigureError("Give a topic or a path under figures/<topic>/ to save '" + str(path) + "'.")
+        path = Path("figures") / topic / path.name
+    topic = resolve_topic(path, topic, writer.topic_ids())
+
+    path = writer.claim(path, unique=auto_named)
+    slide = {
+        "topic": topic,
+        "title": title or infer_title_from_filename(path),
+        "caption": caption,
+        "notes": notes,
+        "tags": tags,
+    }
+    writer.submit(path, _render(fig, dpi), slide)
+    return path
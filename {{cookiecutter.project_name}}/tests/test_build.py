@@ -0,0 +1,15 @@
+"""Writing build outputs."""
+
+import pytest
+
+from slidedeck.build import write_if_changed
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path):
+    def chunks():
+        yield "---\n"
+        raise KeyError("title")
+
+    with pytest.raises(KeyError):
+        write_if_changed(tmp_path / "slides.qmd", chunks(), {})
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,40 @@
+"""Comparison pages of a figure's git history."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from slidedeck import history
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def test_unreadable_version_is_left_out(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+    figure = tmp_path / "figures" / "results" / "loss.png"
+    figure.parent.mkdir(parents=True)
+    for version in ("v1", "v2", "v3"):
+        figure.write_bytes(version.encode())
+        subprocess.run(["git", "add", "."], check=True)
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", version], check=True)
+
+    unreadable = history.get_figure_history("figures/results/loss.png")[1]["commit"]
+    read = history.GitBlobReader.read
+
+    def read_or_fail(self, commit, path):
+        return None if commit == unreadable else read(self, commit, path)
+
+    monkeypatch.setattr(history.GitBlobReader, "read", read_or_fail)
+    history.generate_comparison("figures/results/loss.png", "comparison.html")
+
+    page = (tmp_path / "comparison.html").read_text()
+    assert page.count('<img src="data:') == 2
+
+
+def test_page_names_are_unique(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    names = {history._page_name(path) for path in ("a/b__c.png", "a__b/c.png", "a/b/c.png", "./a/b/c.png")}
+    assert len(names) == 3
+    assert all(name.endswith(".html") and "/" not in name for name in names)
@@ -0,0 +1,43 @@
+"""The Python API raises FigureError where the CLI exits."""
+
+import pytest
+import yaml
+
+from slidedeck.add import FigureError
+from slidedeck.deck import Deck
+from slidedeck.registry import load_registry
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = {"title": "Test", "topics": [{"id": "results", "name": "Results", "order": 1}], "slides": []}
+    (tmp_path / "slides.yaml").write_text(yaml.dump(data))
+    (tmp_path / "figures" / "results").mkdir(parents=True)
+    for name in ("loss.png", "accuracy.png"):
+        (tmp_path / "figures" / "results" / name).write_bytes(b"")
+    (tmp_path / "outside.png").write_bytes(b"")
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    ("figure", "topic", "message"),
+    [
+        ("missing.png", None, "does not exist"),
+        ("outside.png", None, "Could not infer topic"),
+        ("figures/results/loss.png", "nope", "Unknown topic 'nope'"),
+        ("figures/results", None, "matches 2 figures"),
+    ],
+)
+def test_add_raises_figure_error(project, figure, topic, message):
+    with pytest.raises(FigureError, match=message):
+        Deck().add(figure, topic=topic)
+    assert load_registry()["slides"] == []
+
+
+def test_batch_keeps_slides_added_before_an_error(project):
+    deck = Deck()
+    with pytest.raises(FigureError), deck.batch():
+        assert deck.add("figures/results/loss.png")["title"] == "Loss"
+        deck.add("outside.png")
+    assert [s["title"] for s in load_registry()["slides"]] == ["Loss"]
@@ -0,0 +1,45 @@
+"""Reading git objects in-process, checked against the git CLI."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from slidedeck import gitobjects, history
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def git(*args: str) -> str:
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_blob_id_matches_cat_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    (tmp_path / "figures" / "results").mkdir(parents=True)
+    (tmp_path / "figures" / "results" / "loss.png").write_bytes(b"png")
+    git("add", ".")
+    # A submodule entry, as 'git submodule add' would record it
+    git("update-index", "--add", "--cacheinfo", "160000," + "1" * 40 + ",vendor")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "figures")
+    head = history._git_head()
+    assert head == git("rev-parse", "HEAD")
+
+    paths = [
+        "figures/results/loss.png", "figures/results", "figures", "vendor", "vendor/x", "figures/results/loss.png/x"
+    ]
+    with gitobjects.ObjectStore.open() as objects:
+        in_process = [objects.blob_id(head, path) for path in paths]
+    assert in_process == [git("rev-parse", "HEAD:figures/results/loss.png"), None, None, None, None, None]
+
+    monkeypatch.setattr(history, "IN_PROCESS_OBJECTS", -1)
+    assert history.resolve_blob_specs([(head, path) for path in paths]) == in_process
+
+
+def test_git_head_falls_back_to_git(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "empty")
+    monkeypatch.setattr(gitobjects.ObjectStore, "resolve_ref", lambda self, name="HEAD": None)
+    assert history._git_head() == git("rev-parse", "HEAD")
@@ -0,0 +1,67 @@
+"""Incremental updates of the persisted figure history index."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from slidedeck import history
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+FIGURES = ["figures/a.png", "figures/b.png", "figures/c.png", "figures/renamed.png"]
+
+
+def git(*args: str) -> str:
+    command = ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args]
+    return subprocess.run(command, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit(message: str) -> str:
+    git("add", "-A")
+    git("commit", "-q", "--allow-empty", "-m", message)
+    return git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    (tmp_path / "figures").mkdir()
+    for name in ["a", "b", "c"]:
+        (tmp_path / "figures" / (name + ".png")).write_bytes(b"version 1 of " + name.encode() * 50)
+        commit("add " + name)
+    (tmp_path / "figures" / "c.png").write_bytes(b"version 2 of c" * 50)
+    commit("edit c")
+    return tmp_path
+
+
+def test_incremental_update_with_rename_and_delete_matches_rebuild(repo):
+    base = git("rev-parse", "HEAD")
+    index = history.build_history_index(FIGURES)
+
+    git("mv", "figures/a.png", "figures/renamed.png")
+    commit("rename a")
+    (repo / "figures" / "b.png").unlink()
+    commit("delete b")
+    (repo / "figures" / "renamed.png").write_bytes(b"version 2 of a" * 50)
+    head = commit("edit renamed")
+
+    updated = history.update_history_index(index, base, head)
+    assert updated is not None
+    assert updated == history.build_history_index(FIGURES)
+    assert [e["path"] for e in updated["figures/renamed.png"]][-1] == "figures/a.png"
+
+
+def test_rewritten_history_is_rebuilt(repo):
+    base = git("rev-parse", "HEAD")
+    history.get_figure_histories(FIGURES)
+    assert history.load_history_index()["head"] == base
+
+    git("reset", "-q", "--hard", "HEAD~2")
+    (repo / "figures" / "b.png").write_bytes(b"rewritten b" * 50)
+    head = commit("rewrite b")
+
+    assert history.update_history_index(history.load_history_index()["figures"], base, head) is None
+    assert history.get_figure_histories(FIGURES) == history.build_history_index(FIGURES)
+    assert history.load_history_index()["head"] == head
@@ -0,0 +1,31 @@
+"""Perceptual hashes used by compare --cluster."""
+
+import io
+
+import pytest
+
+from slidedeck import imagediff
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def png(color, size=(64, 48), mode="RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_solid_colors_do_not_cluster():
+    hashes = [imagediff.perceptual_hash(png(color)) for color in ("green", "black", "white")]
+    assert imagediff.cluster_hashes(hashes) == [[0], [1], [2]]
+
+
+def test_reencoded_image_clusters():
+    image = Image.new("RGB", (64, 48), "white")
+    image.paste((200, 30, 30), (10, 10, 40, 30))
+    rgb, rgba = io.BytesIO(), io.BytesIO()
+    image.save(rgb, format="PNG")
+    # The same pixels, encoded differently
+    image.convert("RGBA").save(rgba, format="PNG", compress_level=1)
+    hashes = [imagediff.perceptual_hash(rgb.getvalue()), imagediff.perceptual_hash(rgba.getvalue())]
+    assert imagediff.cluster_hashes(hashes) == [[0, 1]]
@@ -0,0 +1,27 @@
+"""Streaming ingest with slidedeck add --stdin."""
+
+import json
+
+import yaml
+
+from slidedeck.ingest import ingest_records
+from slidedeck.registry import read_journal
+
+
+def test_null_fields_take_the_defaults(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    topics = [{"id": "results", "name": "Results", "order": 1}]
+    (tmp_path / "slides.yaml").write_text(yaml.dump({"title": "Test", "topics": topics, "slides": []}))
+    (tmp_path / "figures" / "results").mkdir(parents=True)
+    (tmp_path / "figures" / "results" / "loss.png").write_bytes(b"")
+    records = [
+        {"path": "figures/results/loss.png", "caption": None, "notes": None, "tags": None, "title": None},
+        {"path": "figures/results/loss.png", "caption": 3},
+    ]
+
+    added, rejected = ingest_records([json.dumps(r) + "\n" for r in records], tags=["sweep"])
+
+    assert (added, rejected) == (1, 1)
+    entry = read_journal()[0]
+    assert (entry["caption"], entry["notes"], entry["tags"], entry["title"]) == ("", "", ["sweep"], "Loss")
+    assert "Error: line 2: 'caption' must be a string." in capsys.readouterr().err
@@ -0,0 +1,127 @@
+"""Journaled slides survive compaction, including slides appended while it runs."""
+
+import json
+import multiprocessing
+
+import pytest
+import yaml
+
+from slidedeck import registry
+from slidedeck.registry import (
+    REGISTRY_PATH,
+    append_journal,
+    compact_registry,
+    load_registry,
+    load_slide_index,
+    read_journal,
+    shard_registry,
+)
+
+
+def _slide(slide_id: str, topic: str = "results") -> dict:
+    return {
+        "id": slide_id,
+        "topic": topic,
+        "title": slide_id,
+        "caption": "",
+        "notes": "",
+        "figure": "figures/" + topic + "/" + slide_id + ".png",
+        "created": "2026-01-01",
+        "tags": [],
+    }
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    topics = [{"id": "results", "name": "Results", "order": 1}, {"id": "modeling", "name": "Modeling", "order": 2}]
+    data = {"title": "Test", "topics": topics, "slides": [_slide("existing")]}
+    REGISTRY_PATH.write_text(yaml.dump(data, sort_keys=False))
+    return tmp_path
+
+
+def _slide_ids() -> list[str]:
+    return [s["id"] for s in load_registry()["slides"]]
+
+
+@pytest.mark.parametrize("sharded", [False, True])
+def test_append_during_compaction_is_kept(project, monkeypatch, sharded):
+    if sharded:
+        shard_registry()
+    append_journal([_slide("folded")])
+
+    dump_yaml = registry._dump_yaml
+
+    def dump_then_append(data, target):
+        # Another process appends after the journal was read, before it is folded
+        dump_yaml(data, target)
+        if read_journal()[-1]["id"] != "appended":
+            append_journal([_slide("appended", "modeling")])
+
+    with monkeypatch.context() as patch:
+        patch.setattr(registry, "_dump_yaml", dump_then_append)
+        assert compact_registry() == 1
+
+    assert [e["id"] for e in read_journal()] == ["appended"]
+    assert sorted(_slide_ids()) == ["appended", "existing", "folded"]
+    assert compact_registry() == 1
+    assert read_journal() == []
+    assert sorted(_slide_ids()) == ["appended", "existing", "folded"]
+
+
+def _append_many(writer: int, count: int) -> None:
+    for i in range(count):
+        append_journal([_slide("w" + str(writer) + "_" + str(i))])
+
+
+def test_concurrent_appends_and_compactions(project):
+    writers = [multiprocessing.Process(target=_append_many, args=(w, 50)) for w in range(2)]
+    for writer in writers:
+        writer.start()
+    while any(writer.is_alive() for writer in writers):
+        compact_registry()
+    for writer in writers:
+        writer.join()
+    compact_registry()
+
+    assert read_journal() == []
+    assert len(_slide_ids()) == 101
+    assert len(set(_slide_ids())) == 101
+
+
+def test_slide_index_follows_appends_and_compaction(project):
+    topics, ids = load_slide_index()
+    assert [t["id"] for t in topics] == ["results", "modeling"]
+    assert ids == {"existing"}
+
+    append_journal([_slide("first")])
+    assert load_slide_index()[1] == {"existing", "first"}
+    append_journal([_slide("second")])
+    assert load_slide_index()[1] == {"existing", "first", "second"}
+
+    compact_registry()
+    registry._id_indexes.clear()
+    assert load_slide_index()[1] == {"existing", "first", "second"}
+
+
+def test_append_renumbers_ids_taken_by_other_writers(project):
+    first = [_slide("figure")]
+    append_journal(first)
+    # Generated from the same stale view of the IDs as the first append
+    second = [_slide("figure"), _slide("existing")]
+    append_journal(second)
+
+    assert [e["id"] for e in second] == ["figure_2", "existing_2"]
+    assert sorted(_slide_ids()) == ["existing", "existing_2", "figure", "figure_2"]
+
+
+def test_duplicate_journal_ids_are_renumbered_once(project):
+    # A journal written before IDs were checked under the lock
+    entries = [_slide("existing"), dict(_slide("figure"), title="a"), dict(_slide("figure"), title="b")]
+    with open(registry.journal_path(), "a") as f:
+        f.writelines(json.dumps(dict(entry, caption="new")) + "\n" for entry in entries)
+
+    assert sorted(_slide_ids()) == ["existing", "existing_2", "figure", "figure_2"]
+    assert compact_registry() == 3
+    assert read_journal() == []
+    assert sorted(_slide_ids()) == ["existing", "existing_2", "figure", "figure_2"]
@@ -0,0 +1,51 @@
+"""build --split edits only the Slides entry of the _quarto.yml navbar."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from slidedeck.build import update_quarto_navbar
+
+CONFIG = """\
+# Site settings
+website:
+  title: "Research Figures"
+  navbar:
+    left:
+      - text: "Slides"
+        href: slides.qmd
+      - text: "Recent"   # newest figures
+        href: recent.qmd
+
+format:
+  revealjs:
+    theme: default
+"""
+
+DECKS = [("Modeling", Path("slides-modeling.qmd"), 2), ("Results", Path("slides-results.qmd"), 3)]
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "_quarto.yml"
+    path.write_text(CONFIG)
+    return path
+
+
+def test_split_keeps_the_rest_of_the_file(config):
+    assert update_quarto_navbar(DECKS, {})
+    text = config.read_text()
+    assert text.startswith("# Site settings\nwebsite:\n  title: \"Research Figures\"\n")
+    assert '      - text: "Recent"   # newest figures\n' in text
+    left = yaml.safe_load(text)["website"]["navbar"]["left"]
+    assert left[0]["menu"][2] == {"text": "Results", "href": "slides-results.qmd"}
+
+    assert not update_quarto_navbar(DECKS, {})
+
+
+def test_merge_restores_a_single_link(config):
+    update_quarto_navbar(DECKS, {})
+    assert update_quarto_navbar([], {})
+    assert config.read_text() == CONFIG.replace('- text: "Slides"', "- text: Slides")
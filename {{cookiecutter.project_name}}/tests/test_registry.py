@@ -0,0 +1,126 @@
+"""The compiled registry snapshot under .slidedeck/."""
+
+import datetime
+import pickle
+
+import pytest
+import yaml
+
+from slidedeck import registry
+
+REGISTRY = """\
+title: Test
+topics:
+  - id: results
+    name: Results
+    order: 1
+slides:
+  - id: 2026-01-01_loss
+    topic: results
+    title: Loss
+    created: 2026-01-01
+    tags: []
+"""
+
+
+class _Payload:
+    def __reduce__(self):
+        return (open, ("pwned", "w"))
+
+
+def test_snapshot_keeps_dates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "slides.yaml").write_text(REGISTRY)
+    first = registry.load_registry()
+    assert registry.load_registry() == first == yaml.safe_load(REGISTRY)
+    assert first["slides"][0]["created"] == datetime.date(2026, 1, 1)
+
+
+def test_crafted_cache_files_do_not_run_code(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "slides.yaml").write_text(REGISTRY)
+    registry.load_registry()
+    registry.load_slide_index()
+    cache_files = list((tmp_path / ".slidedeck").glob("*.marshal"))
+    assert len(cache_files) == 2
+    registry._id_indexes.clear()
+    for cache_file in cache_files:
+        cache_file.write_bytes(pickle.dumps(_Payload()))
+
+    assert registry.load_registry() == yaml.safe_load(REGISTRY)
+    assert registry.load_slide_index()[1] == {"2026-01-01_loss"}
+    assert not (tmp_path / "pwned").exists()
+
+
+EDGE_CASES = """\
+title: Test
+# Topics first, slides below
+topics:
+  - {id: results, name: Results, order: 1}
+slides:
+  # Newest first
+  - id: s1
+    topic: results
+    title: "Loss: train # not a comment"
+    caption: |
+      First line
+
+      - not a list item
+      slides:
+    tags: [a, b]
+  - {id: s2, topic: results, title: Flow, tags: []}
+
+  - id: s3
+    topic: results
+    title: Folded
+    notes: >-
+      one
+      two
+    tags:
+    - c
+  -
+    id: s4
+    topic: results
+    title: Dash on its own line
+extra: kept
+"""
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        ("title: Flow", "title: Flow edited"),
+        ("      one\n", "      one and a half\n"),
+        ("title: Dash on its own line", "title: Edited last"),
+        ("  # Newest first\n", "  # Newest first, edited\n"),
+    ],
+)
+def test_incremental_parse_matches_full_parse(tmp_path, monkeypatch, edit):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "slides.yaml"
+    path.write_text(EDGE_CASES)
+    assert registry.load_yaml_cached(path) == yaml.safe_load(EDGE_CASES)
+
+    edited = EDGE_CASES.replace(*edit)
+    assert edited != EDGE_CASES
+    path.write_text(edited)
+    registry.reset_parse_stats()
+    assert registry.load_yaml_cached(path) == yaml.safe_load(edited)
+    # Only the edited slide is parsed again
+    assert registry.parse_stats["parsed"] <= 1
+
+
+def test_incremental_parse_of_yaml_dump_layout(tmp_path, monkeypatch):
+    # yaml.dump writes the slide list without indentation
+    monkeypatch.chdir(tmp_path)
+    slides = [{"id": "s" + str(i), "topic": "results", "caption": "line 1\nline 2\n", "tags": ["t"]} for i in range(3)]
+    text = yaml.dump({"title": "Test", "slides": slides, "topics": []}, sort_keys=False)
+    path = tmp_path / "slides.yaml"
+    path.write_text(text)
+    registry.load_yaml_cached(path)
+
+    edited = text.replace("id: s1", "id: s1_edited")
+    path.write_text(edited)
+    registry.reset_parse_stats()
+    assert registry.load_yaml_cached(path) == yaml.safe_load(edited)
+    assert registry.parse_stats == {"parsed": 1, "reused": 2}
@@ -0,0 +1,39 @@
+"""Importing slides.yaml into the SQLite backend."""
+
+import pytest
+import yaml
+
+from slidedeck import store
+from slidedeck.build import build_slides
+
+
+def test_import_rejects_duplicate_ids(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    slide = {"id": "2026-01-01_loss", "topic": "results", "title": "Loss", "created": "2026-01-01", "tags": []}
+    data = {"title": "Test", "topics": [{"id": "results", "name": "Results", "order": 1}], "slides": [slide, slide]}
+    (tmp_path / "slides.yaml").write_text(yaml.dump(data))
+
+    with pytest.raises(store.DuplicateSlideIdError, match="2026-01-01_loss"):
+        store.import_yaml()
+    assert store.count_slides(store.connect()) == 0
+
+
+def test_tag_filter_matches_yaml_build(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    topics = [{"id": "results", "name": "Results", "order": 1}, {"id": "modeling", "name": "Modeling", "order": 2}]
+    slides = [
+        {"id": "s" + str(i), "topic": topics[i % 2]["id"], "title": "Figure " + str(i), "caption": "",
+         "figure": "figures/f" + str(i) + ".png", "created": "2026-01-0" + str(1 + i), "tags": tags}
+        for i, tags in enumerate([["paper"], [], ["paper", "draft"], ["draft"], ["talk"]])
+    ]
+    (tmp_path / "slides.yaml").write_text(yaml.dump({"title": "Test", "topics": topics, "slides": slides}))
+
+    outputs = []
+    for backend in ("yaml", "sqlite"):
+        if backend == "sqlite":
+            store.import_yaml()
+        build_slides(tags={"paper", "talk"})
+        outputs.append([(tmp_path / name).read_text() for name in ("slides.qmd", "recent.qmd")])
+    assert outputs[0] == outputs[1]
+    assert all("Figure " + str(i) in outputs[0][0] for i in (0, 2, 4))
+    assert not any("Figure " + str(i) in outputs[0][0] for i in (1, 3))
@@ -0,0 +1,70 @@
+"""Background savefig: ordered registration and errors surfacing in flush()."""
+
+import time
+
+import pytest
+import yaml
+
+from slidedeck import writer
+from slidedeck.add import FigureError
+from slidedeck.registry import read_journal
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+plt = pytest.importorskip("matplotlib.pyplot")
+pytest.importorskip("PIL")
+
+
+@pytest.fixture
+def figure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    topics = [{"id": "results", "name": "Results", "order": 1}, {"id": "modeling", "name": "Modeling", "order": 2}]
+    (tmp_path / "slides.yaml").write_text(yaml.dump({"title": "Test", "topics": topics, "slides": []}))
+    fig, ax = plt.subplots(figsize=(2, 2))
+    ax.plot([1, 2, 3])
+    ax.set_title("Loss")
+    yield fig
+    plt.close(fig)
+    writer.close()
+
+
+def test_figures_are_registered_in_call_order(figure):
+    paths = [writer.savefig(figure, "step_" + str(i), topic="results") for i in range(20)]
+    writer.flush()
+    assert all(path.exists() for path in paths)
+    assert [e["figure"] for e in read_journal()] == [str(path) for path in paths]
+
+
+def test_invalid_names_raise_right_away(figure):
+    with pytest.raises(FigureError, match="PNG"):
+        writer.savefig(figure, "loss.jpg", topic="results")
+    with pytest.raises(FigureError, match="Unknown topic"):
+        writer.savefig(figure, "loss", topic="nope")
+
+
+def test_background_errors_are_raised_by_flush(figure, tmp_path):
+    # A file where the topic directory should be makes the background write fail
+    (tmp_path / "figures").mkdir()
+    (tmp_path / "figures" / "modeling").write_text("")
+    writer.savefig(figure, "broken", topic="modeling")
+    writer.savefig(figure, "fine", topic="results")
+    with pytest.raises(OSError):
+        writer.flush()
+    assert [e["title"] for e in read_journal()] == ["Fine"]
+    writer.flush()
+
+
+def test_flush_does_not_wait_for_done_callbacks(figure, tmp_path, monkeypatch):
+    # Futures wake wait() before running their done callbacks; a slow callback must not hide the error
+    done = writer._Writer._done
+
+    def slow_done(self, future, path):
+        time.sleep(0.2)
+        done(self, future, path)
+
+    monkeypatch.setattr(writer._Writer, "_done", slow_done)
+    (tmp_path / "figures").mkdir()
+    (tmp_path / "figures" / "modeling").write_text("")
+    writer.savefig(figure, "broken", topic="modeling")
+    with pytest.raises(OSError):
+        writer.flush()